@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+TOKEN_VERSION_CLAIM = "ver"
+TOKEN_USER_CLAIMS = ("username", "role", "is_staff")
+
+
+def add_user_claims(token, user):
+    """Put fields the permission classes need into the token."""
+    for claim in TOKEN_USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def token_version_key(user_id):
+    return f"api:token-version:{user_id}"
+
+
+def get_token_version(user_id):
+    """
+    Return the current token version of an active user, None otherwise.
+
+    The value is cached for TOKEN_VERSION_CACHE_TIMEOUT seconds, which
+    bounds how long a revoked token keeps working in other processes.
+    """
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        cache.set(
+            key,
+            -1 if version is None else version,
+            settings.TOKEN_VERSION_CACHE_TIMEOUT,
+        )
+    return None if version == -1 else version
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from token claims.
+
+    The user is a ``User`` instance with only the claimed fields loaded;
+    other fields are deferred and load on first access. Tokens are
+    rejected once the user's token version moves on.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = validated_token[TOKEN_VERSION_CLAIM]
+        if get_token_version(user_id) != version:
+            raise AuthenticationFailed(
+                "Token is revoked.", code="token_revoked"
+            )
+        loaded = {"id": user_id, "token_version": version, "is_active": True}
+        for claim in TOKEN_USER_CLAIMS:
+            loaded[claim] = validated_token[claim]
+        # from_db() expects values in the model field order.
+        fields = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in loaded
+        ]
+        return User.from_db(None, fields, [loaded[name] for name in fields])
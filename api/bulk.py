@@ -0,0 +1,253 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Now
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .cache import bump_versions
+from .changes import Actions, record_changes
+from .models import Category, Genre, Title
+from .validators import less_than_current
+
+NON_FIELD_ERRORS_KEY = api_settings.NON_FIELD_ERRORS_KEY
+
+
+class BulkSlugSerializer(serializers.Serializer):
+    """Item of a bulk genre or category upsert, matched by slug."""
+
+    name = serializers.CharField(max_length=200)
+    slug = serializers.SlugField(max_length=50)
+
+
+class BulkTitleSerializer(serializers.Serializer):
+    """
+    Item of a bulk title upsert.
+
+    Items with an id update that title, other items create new ones.
+    Relations are plain slugs resolved for the whole batch at once.
+    """
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    name = serializers.CharField(max_length=200)
+    year = serializers.IntegerField(
+        required=False, allow_null=True, validators=[less_than_current]
+    )
+    description = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True
+    )
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False
+    )
+    category = serializers.SlugField(required=False, allow_null=True)
+
+
+def missing_slug_error(slug):
+    return f"Object with slug={slug} does not exist."
+
+
+def find_duplicates(items, key, errors):
+    """Report items repeating the ``key`` value of an earlier item."""
+    seen = set()
+    for item, item_errors in zip(items, errors):
+        value = item.get(key)
+        if value is None:
+            continue
+        if value in seen:
+            item_errors.setdefault(key, []).append(
+                f"Duplicate {key} {value} in the batch."
+            )
+        seen.add(value)
+
+
+def upsert_slugged(model, items, errors):
+    """
+    Create or rename genres or categories in one transaction.
+
+    ``errors`` holds validation errors of the items and receives errors
+    found against the database; nothing is saved if any item has errors.
+    """
+    find_duplicates(items, "slug", errors)
+    if any(errors):
+        return
+    slugs = [item["slug"] for item in items]
+    with transaction.atomic():
+        # Locked rows cannot change between the read and the update.
+        existing = model.objects.select_for_update().in_bulk(
+            slugs, field_name="slug"
+        )
+        created, renamed = [], []
+        for item in items:
+            obj = existing.get(item["slug"])
+            if obj is None:
+                created.append(model(name=item["name"], slug=item["slug"]))
+            elif obj.name != item["name"]:
+                obj.name = item["name"]
+                renamed.append(obj)
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(renamed, ["name"])
+        record_changes(model, [obj.slug for obj in created], Actions.CREATED)
+        record_changes(model, [obj.slug for obj in renamed])
+        if renamed:
+            # Titles render genre and category names.
+            lookup = "genre__in" if model is Genre else "category__in"
+            titles = Title.objects.filter(**{lookup: renamed})
+            record_changes(Title, titles.values_list("pk", flat=True))
+            titles.update(updated_at=Now())
+    bump_versions(model, Title)
+
+
+def resolve_title_relations(items, errors):
+    """Map genre and category slugs of all items with two queries."""
+    genre_slugs = {slug for item in items for slug in item.get("genre", ())}
+    category_slugs = {
+        item["category"] for item in items if item.get("category")
+    }
+    genres = dict(
+        Genre.objects.filter(slug__in=genre_slugs).values_list("slug", "id")
+    )
+    categories = dict(
+        Category.objects.filter(slug__in=category_slugs)
+        .values_list("slug", "id")
+    )
+    for item, item_errors in zip(items, errors):
+        missing = [
+            slug for slug in item.get("genre", ()) if slug not in genres
+        ]
+        if missing:
+            item_errors["genre"] = [
+                missing_slug_error(slug) for slug in missing
+            ]
+        category = item.get("category")
+        if category and category not in categories:
+            item_errors["category"] = [missing_slug_error(category)]
+    return genres, categories
+
+
+def upsert_titles(items, errors):
+    """
+    Create or update titles with their genres in one transaction.
+
+    Errors are collected like in upsert_slugged(). Saved items get the id
+    of their title.
+    """
+    find_duplicates(items, "id", errors)
+    with transaction.atomic():
+        genres, categories = resolve_title_relations(items, errors)
+        existing = Title.objects.select_for_update().in_bulk(
+            [item["id"] for item in items if "id" in item]
+        )
+        for item, item_errors in zip(items, errors):
+            if "id" in item and item["id"] not in existing:
+                item_errors["id"] = [
+                    f"Title with id {item['id']} does not exist."
+                ]
+        if any(errors):
+            return
+
+        titles = build_titles(items, existing, categories)
+        save_titles(titles, existing)
+        relinked = [
+            (title, item["genre"])
+            for title, item in zip(titles, items)
+            if "genre" in item
+        ]
+        Title.genre.through.objects.filter(
+            title_id__in=[title.pk for title, _ in relinked]
+        ).delete()
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genres[slug])
+            for title, slugs in relinked
+            for slug in dict.fromkeys(slugs)
+        )
+    bump_versions(Title)
+    for title, item in zip(titles, items):
+        item["id"] = title.pk
+
+
+def build_titles(items, existing, categories):
+    """Apply item fields to existing titles or new unsaved ones."""
+    now = timezone.now()
+    titles = []
+    for item in items:
+        title = existing.get(item.get("id")) or Title()
+        title.name = item["name"]
+        for field in ("year", "description"):
+            if field in item:
+                setattr(title, field, item[field])
+        if "category" in item:
+            title.category_id = categories.get(item["category"])
+        title.updated_at = now
+        titles.append(title)
+    return titles
+
+
+def save_titles(titles, existing):
+    created = [title for title in titles if title.pk is None]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(created)
+        record_changes(Title, [title.pk for title in created], Actions.CREATED)
+    else:
+        # The backend does not return ids of inserted rows. Signals of
+        # save() record these titles in the change feed.
+        for title in created:
+            title.save()
+    Title.objects.bulk_update(
+        list(existing.values()),
+        ["name", "year", "description", "category", "updated_at"],
+    )
+    record_changes(Title, list(existing))
+
+
+class BulkUpsertMixin:
+    """
+    Add a ``bulk`` POST action taking an array of objects.
+
+    The whole batch is saved in one transaction or, if any item is
+    invalid, rejected with per-item errors in the order of the input. A
+    batch colliding with a concurrent write, such as a genre deleted
+    meanwhile, is rejected as a whole.
+    """
+
+    bulk_serializer_class = None
+
+    def perform_bulk_upsert(self, items, errors):
+        raise NotImplementedError
+
+    @action(detail=False, methods=["POST"])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            raise serializers.ValidationError({
+                NON_FIELD_ERRORS_KEY: ["Expected a list of items."]
+            })
+        if len(request.data) > settings.BULK_MAX_ITEMS:
+            raise serializers.ValidationError({
+                NON_FIELD_ERRORS_KEY: [
+                    f"Send at most {settings.BULK_MAX_ITEMS} items at once."
+                ]
+            })
+        items, errors = [], []
+        for data in request.data:
+            serializer = self.bulk_serializer_class(data=data)
+            if serializer.is_valid():
+                items.append(dict(serializer.validated_data))
+                errors.append({})
+            else:
+                items.append({})
+                errors.append(serializer.errors)
+        # Items are checked against the database even if some are invalid,
+        # so all problems of a batch are reported at once.
+        try:
+            self.perform_bulk_upsert(items, errors)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                NON_FIELD_ERRORS_KEY: [
+                    "The batch conflicts with a concurrent change, "
+                    "send it again."
+                ]
+            })
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return Response(items, status=status.HTTP_200_OK)
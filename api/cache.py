@@ -0,0 +1,98 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+REPLICA_LAG_KEY = "api:replica-lag"
+
+
+def get_api_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def version_key(model):
+    return f"api:version:{model._meta.label_lower}"
+
+
+def get_versions(models):
+    """Return current cache versions of the given models."""
+    cache = get_api_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A fresh version is time based, so entries cached before the
+            # key was evicted can never be matched again.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*models):
+    """
+    Invalidate every cached response depending on the given models.
+
+    Versions move once the current transaction commits: a reader taking
+    the new version earlier could still see the old rows and cache them
+    under it.
+    """
+    transaction.on_commit(lambda: _bump_versions(models))
+
+
+def _bump_versions(models):
+    cache = get_api_cache()
+    for model in models:
+        key = version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    if settings.REPLICA_DATABASES:
+        # Replicas may not have the write yet, responses read from them
+        # must not be cached under the new versions.
+        cache.set(REPLICA_LAG_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+def response_cache_key(request, models):
+    versions = ".".join(str(version) for version in get_versions(models))
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"api:response:{url}:{versions}"
+
+
+class CachedListMixin:
+    """
+    Serve anonymous list responses from the API cache.
+
+    Cache keys carry versions of ``cache_models``, which are bumped by model
+    signals, so a write makes stale entries unreachable at once.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not request.user.is_anonymous or not settings.API_CACHE_TIMEOUT:
+            return handler(request, *args, **kwargs)
+        cache = get_api_cache()
+        key = response_cache_key(request, self.cache_models)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not cache.get(REPLICA_LAG_KEY):
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class CachedRetrieveMixin(CachedListMixin):
+    """Serve anonymous list and detail responses from the API cache."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
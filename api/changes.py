@@ -0,0 +1,70 @@
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models import Category, Change, Genre
+
+Actions = Change.Actions
+
+# Key of the PostgreSQL advisory lock held while entries are numbered.
+NUMBERING_LOCK = 0x6368616e676573
+
+
+def change_key(model, instance):
+    """Key of the object in API URLs: slug for genres and categories."""
+    if model in (Category, Genre):
+        return instance.slug
+    return str(instance.pk)
+
+
+def record_changes(model, keys, action=Actions.UPDATED):
+    """
+    Append one change feed entry per object key with a single insert.
+
+    Entries get their sequence numbers once the transaction commits.
+    """
+    Change.objects.bulk_create(
+        Change(model=model._meta.model_name, object_id=str(key), action=action)
+        for key in keys
+    )
+    # One numbering per transaction is enough. Callbacks of rolled back
+    # savepoints leave run_on_commit, so a registration that would never
+    # run is not mistaken for a pending one.
+    if not any(
+        callback[1] is number_changes for callback in connection.run_on_commit
+    ):
+        transaction.on_commit(number_changes)
+
+
+def record_change(instance, action):
+    model = type(instance)
+    record_changes(model, [change_key(model, instance)], action)
+
+
+def number_changes():
+    """
+    Number committed entries that have no sequence number yet.
+
+    Numbers taken inside the writing transaction could commit out of
+    order, and a client past a later number would never see an earlier
+    one. Numbering runs one transaction at a time instead, under a lock
+    held until it commits, so a number is only visible after all
+    smaller ones. Entries left behind by a process that died right after
+    its commit are numbered by the next write.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s)", [NUMBERING_LOCK]
+                )
+        entries = list(
+            Change.objects.filter(seq=None).order_by("id").only("id")
+        )
+        if not entries:
+            return
+        last_seq = Change.objects.aggregate(
+            last_seq=Max("seq")
+        )["last_seq"] or 0
+        for number, entry in enumerate(entries, last_seq + 1):
+            entry.seq = number
+        Change.objects.bulk_update(entries, ["seq"], batch_size=500)
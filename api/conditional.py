@@ -0,0 +1,79 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalRetrieveMixin:
+    """
+    Answer repeated detail GET requests with 304 Not Modified.
+
+    Validators come from ``updated_at`` of the row, read from
+    ``get_validator_queryset()`` by primary key lookup. Nothing is
+    serialized when the client copy is current.
+    """
+
+    def get_validator_queryset(self):
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            last_modified = (
+                self.get_validator_queryset()
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup is answered with 404 by get_object().
+            last_modified = None
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            super().retrieve, last_modified, 1, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, last_modified, count, request,
+                             *args, **kwargs):
+        version = ":".join((
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            str(count),
+            last_modified.isoformat() if last_modified else "",
+        ))
+        etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+        # HTTP dates have whole seconds, If-Modified-Since is compared
+        # against the truncated value.
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
+        )
+        if not_modified is not None:
+            return not_modified
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ConditionalGetMixin(ConditionalRetrieveMixin):
+    """
+    Answer repeated list and detail GET requests with 304 Not Modified.
+
+    List validators are one aggregate: the latest ``updated_at`` and the
+    row count, which also changes on deletes.
+    """
+
+    def list(self, request, *args, **kwargs):
+        state = self.get_validator_queryset().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        return self.conditional_response(
+            super().list, state["last_modified"], state["count"],
+            request, *args, **kwargs
+        )
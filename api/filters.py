@@ -1,6 +1,24 @@
 from django_filters import rest_framework as filters
 
 from .models import Title
+from .search import search_titles
+
+# Leaderboard orderings backed by the ranking indexes of Title. Ties are
+# broken by id in the same direction, a "-" prefix sorts descending.
+TITLE_ORDERINGS = {
+    "rating": ("weighted_rating", "id"),
+    "review_count": ("review_count", "id"),
+    "trending": ("recent_review_count", "id"),
+}
+
+
+def title_ordering(value):
+    """Return order_by() fields for an ``ordering`` value, None if unknown."""
+    fields = TITLE_ORDERINGS.get((value or "").lstrip("-"))
+    if fields is None:
+        return None
+    prefix = "-" if value.startswith("-") else ""
+    return tuple(prefix + field for field in fields)
 
 
 class TitleFilter(filters.FilterSet):
@@ -12,7 +30,22 @@ class TitleFilter(filters.FilterSet):
     genre = filters.CharFilter(field_name="genre__slug", lookup_expr="iexact")
     name = filters.CharFilter(field_name="name", lookup_expr="contains")
     year = filters.NumberFilter(field_name="year", lookup_expr="iexact")
+    search = filters.CharFilter(method="filter_search")
+    ordering = filters.ChoiceFilter(
+        method="filter_ordering",
+        choices=[
+            (prefix + name, prefix + name)
+            for name in TITLE_ORDERINGS
+            for prefix in ("", "-")
+        ],
+    )
 
     class Meta:
         model = Title
-        fields = ["category", "genre", "name", "year"]
+        fields = ["category", "genre", "name", "year", "search", "ordering"]
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*title_ordering(value))
@@ -0,0 +1,261 @@
+import csv
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.cache import bump_versions
+from api.models import Category, Comment, Genre, Review, Title, User
+
+UNUSABLE_PASSWORD = make_password(None)
+
+
+def optional_int(value):
+    return int(value) if value else None
+
+
+def build_user(row):
+    return User(
+        id=row["id"],
+        username=row["username"],
+        email=row["email"],
+        role=row["role"],
+        bio=row["description"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        password=UNUSABLE_PASSWORD,
+    )
+
+
+def build_category(row):
+    return Category(id=row["id"], name=row["name"], slug=row["slug"])
+
+
+def build_genre(row):
+    return Genre(id=row["id"], name=row["name"], slug=row["slug"])
+
+
+def build_title(row):
+    return Title(
+        id=row["id"],
+        name=row["name"],
+        year=optional_int(row["year"]),
+        category_id=optional_int(row["category"]),
+    )
+
+
+def build_genre_title(row):
+    return Title.genre.through(
+        id=row["id"], title_id=row["title_id"], genre_id=row["genre_id"]
+    )
+
+
+def build_review(row):
+    return Review(
+        id=row["id"],
+        title_id=row["title_id"],
+        author_id=row["author"],
+        text=row["text"],
+        score=row["score"],
+        pub_date=parse_datetime(row["pub_date"]),
+    )
+
+
+def build_comment(row):
+    return Comment(
+        id=row["id"],
+        review_id=row["review_id"],
+        author_id=row["author"],
+        text=row["text"],
+        pub_date=parse_datetime(row["pub_date"]),
+    )
+
+
+Source = namedtuple(
+    "Source", ("filename", "model", "build", "references", "dated", "unique")
+)
+
+# Files in dependency order. ``references`` maps foreign key columns to the
+# model they refer to, ``dated`` lists auto_now_add fields read from the
+# file and ``unique`` the fields of a unique constraint besides the id.
+SOURCES = (
+    Source("users.csv", User, build_user, {}, (), ()),
+    Source("category.csv", Category, build_category, {}, (), ()),
+    Source("genre.csv", Genre, build_genre, {}, (), ()),
+    Source("titles.csv", Title, build_title, {"category": Category}, (), ()),
+    Source(
+        "genre_title.csv",
+        Title.genre.through,
+        build_genre_title,
+        {"title_id": Title, "genre_id": Genre},
+        (),
+        ("title_id", "genre_id"),
+    ),
+    Source(
+        "review.csv",
+        Review,
+        build_review,
+        {"title_id": Title, "author": User},
+        ("pub_date",),
+        ("title_id", "author_id"),
+    ),
+    Source(
+        "comments.csv",
+        Comment,
+        build_comment,
+        {"review_id": Review, "author": User},
+        ("pub_date",),
+        (),
+    ),
+)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    chunk = list(islice(rows, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, size))
+
+
+def existing_ids(model, ids):
+    """Return ids from the given set that exist, in a single query."""
+    if not ids:
+        return set()
+    return set(
+        model.objects.filter(id__in=ids)
+        .order_by()
+        .values_list("id", flat=True)
+    )
+
+
+def unique_key(obj, fields):
+    return tuple(int(getattr(obj, field)) for field in fields)
+
+
+def existing_keys(model, fields, keys):
+    """Return the given unique keys that are already stored."""
+    if not keys:
+        return set()
+    lookups = {
+        f"{field}__in": {key[position] for key in keys}
+        for position, field in enumerate(fields)
+    }
+    return set(
+        model.objects.filter(**lookups).order_by().values_list(*fields)
+    )
+
+
+@contextmanager
+def imported_dates(model, field_names):
+    """Keep dates from the file instead of auto_now_add timestamps."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = "Load the CSV fixtures from the data directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "data"),
+            help="Directory containing the CSV files.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows read and inserted at once.",
+        )
+        parser.add_argument(
+            "--skip-existing",
+            action="store_true",
+            help="Ignore rows conflicting with already stored ones.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.isdir(path):
+            raise CommandError(f"Directory {path} does not exist.")
+        for source in SOURCES:
+            file_path = os.path.join(path, source.filename)
+            if not os.path.exists(file_path):
+                self.stdout.write(f"{source.filename}: not found, skipped.")
+                continue
+            self.load(file_path, source, options)
+        self.reset_sequences()
+        bump_versions(User, Category, Genre, Title, Review, Comment)
+        call_command("refresh_ratings", stdout=self.stdout)
+        call_command("rebuild_title_stats", stdout=self.stdout)
+        call_command("refresh_rankings", stdout=self.stdout)
+
+    def load(self, file_path, source, options):
+        started = time.monotonic()
+        loaded = skipped = 0
+        with open(file_path, encoding="utf-8", newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            for rows in chunked(reader, options["batch_size"]):
+                known = {
+                    column: existing_ids(
+                        related_model,
+                        {int(row[column]) for row in rows if row[column]},
+                    )
+                    for column, related_model in source.references.items()
+                }
+                objects = [
+                    source.build(row)
+                    for row in rows
+                    if not any(
+                        row[column] and int(row[column]) not in ids
+                        for column, ids in known.items()
+                    )
+                ]
+                if source.unique:
+                    objects = self.drop_duplicates(source, objects)
+                skipped += len(rows) - len(objects)
+                model = source.model
+                with transaction.atomic(), imported_dates(model, source.dated):
+                    model.objects.bulk_create(
+                        objects, ignore_conflicts=options["skip_existing"]
+                    )
+                loaded += len(objects)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{os.path.basename(file_path)}: {loaded} rows loaded, "
+            f"{skipped} skipped in {elapsed:.2f}s "
+            f"({loaded / max(elapsed, 1e-6):.0f} rows/s)."
+        )
+
+    def drop_duplicates(self, source, objects):
+        """Skip rows repeating a unique key in the chunk or the table."""
+        keys = [unique_key(obj, source.unique) for obj in objects]
+        seen = existing_keys(source.model, source.unique, set(keys))
+        unique_objects = []
+        for obj, key in zip(objects, keys):
+            if key not in seen:
+                seen.add(key)
+                unique_objects.append(obj)
+        return unique_objects
+
+    def reset_sequences(self):
+        models = [source.model for source in SOURCES]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from api.models import OutboxEmail
+
+Statuses = OutboxEmail.Statuses
+
+
+class Command(BaseCommand):
+    help = "Delete delivered and failed outbox emails past the retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.OUTBOX_RETENTION_DAYS,
+            help="Keep emails queued in this many last days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of email ids deleted per statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        done = OutboxEmail.objects.filter(
+            status__in=[Statuses.SENT, Statuses.FAILED],
+            created_at__lt=cutoff,
+        )
+        bounds = done.aggregate(first_id=Min("id"), last_id=Max("id"))
+        deleted = 0
+        if bounds["last_id"] is not None:
+            for start in range(
+                bounds["first_id"] - 1, bounds["last_id"], batch_size
+            ):
+                deleted += done.filter(
+                    id__gt=start,
+                    id__lte=min(start + batch_size, bounds["last_id"]),
+                ).delete()[0]
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} outbox emails.")
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from api.models import Title, TitleStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild title score histograms from reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of title ids rebuilt per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = Title.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        rebuilt = 0
+        for start in range(0, last_id, batch_size):
+            rebuilt += TitleStats.objects.rebuild(
+                Title.objects.filter(id__gt=start, id__lte=start + batch_size)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt histograms of {rebuilt} titles.")
+        )
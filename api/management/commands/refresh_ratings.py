@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from api.cache import bump_versions
+from api.models import Title
+
+
+class Command(BaseCommand):
+    help = "Recalculate stored title ratings from reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of title ids updated per statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = Title.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            updated += Title.objects.filter(
+                id__gt=start, id__lte=start + batch_size
+            ).refresh_rating()
+        bump_versions(Title)
+        self.stdout.write(
+            self.style.SUCCESS(f"Recalculated rating of {updated} titles.")
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.outbox import send_batch
+
+
+class Command(BaseCommand):
+    help = "Deliver emails queued in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help="Number of emails sent over one mail connection.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when empty.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help="Seconds to wait when there is nothing to send.",
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                sent, failed = send_batch(options["batch_size"])
+            except OSError as error:
+                # The mail server is unreachable, nothing was attempted.
+                if not options["loop"]:
+                    raise
+                self.stderr.write(f"Mail connection failed: {error!r}")
+                time.sleep(options["interval"])
+                continue
+            total_sent += sent
+            total_failed += failed
+            if failed:
+                self.stderr.write(f"{failed} emails failed, will retry.")
+            if sent + failed < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {total_sent} emails, {total_failed} attempts failed."
+            )
+        )
@@ -1,4 +1,24 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Avg,
+    Count,
+    DateTimeField,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest, Now, NullIf
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -28,3 +48,142 @@ class UserManager(BaseUserManager):
             raise ValueError('Superuser must have is_superuser=True.')
 
         return self._create_user(email, password, **extra_fields)
+
+
+class TitleQuerySet(models.QuerySet):
+    """QuerySet maintaining denormalized review statistics of titles."""
+
+    def apply_review_delta(self, count, score, recent=0, reviewed_at=None):
+        """
+        Shift stored review count and score sum, recalculating rating.
+
+        ``recent`` shifts the count of reviews inside the trending window,
+        ``reviewed_at`` is the publication date of an added review.
+        """
+        review_count = F("review_count") + count
+        score_sum = F("score_sum") + score
+        values = {
+            "review_count": review_count,
+            "score_sum": score_sum,
+            "rating": Cast(score_sum, FloatField()) / NullIf(review_count, 0),
+            "weighted_rating": weighted_rating(review_count, score_sum),
+            "updated_at": Now(),
+        }
+        if recent:
+            values["recent_review_count"] = Greatest(
+                F("recent_review_count") + recent, 0
+            )
+        if reviewed_at is not None:
+            reviewed_at = Value(reviewed_at, output_field=DateTimeField())
+            values["last_reviewed_at"] = Greatest(
+                Coalesce("last_reviewed_at", reviewed_at), reviewed_at
+            )
+        return self.update(**values)
+
+    def refresh_rating(self):
+        """Recalculate stored review statistics from the reviews table."""
+        reviews = title_reviews()
+        review_count = Coalesce(
+            Subquery(reviews.annotate(value=Count("pk")).values("value")), 0
+        )
+        score_sum = Coalesce(
+            Subquery(reviews.annotate(value=Sum("score")).values("value")), 0
+        )
+        return self.update(
+            review_count=review_count,
+            score_sum=score_sum,
+            rating=Subquery(
+                reviews.annotate(value=Avg("score")).values("value")
+            ),
+            weighted_rating=weighted_rating(review_count, score_sum),
+            updated_at=Now(),
+        )
+
+    def refresh_rankings(self):
+        """Recalculate ranking columns, moving the trending window on."""
+        reviews = title_reviews()
+        recent_since = timezone.now() - timedelta(
+            days=settings.RANKING_RECENT_DAYS
+        )
+        recent_reviews = reviews.filter(pub_date__gte=recent_since)
+        return self.update(
+            weighted_rating=weighted_rating(
+                F("review_count"), F("score_sum")
+            ),
+            recent_review_count=Coalesce(
+                Subquery(
+                    recent_reviews.annotate(value=Count("pk")).values("value")
+                ),
+                0,
+            ),
+            last_reviewed_at=Subquery(
+                reviews.annotate(value=Max("pub_date")).values("value")
+            ),
+        )
+
+
+def title_reviews():
+    """Reviews of the outer title, grouped for aggregate subqueries."""
+    review_model = apps.get_model("api", "Review")
+    return (
+        review_model.objects.filter(title=OuterRef("pk"))
+        .order_by()
+        .values("title")
+    )
+
+
+def weighted_rating(review_count, score_sum):
+    """
+    Bayesian average of review scores.
+
+    Every title gets RANKING_MIN_REVIEWS extra votes of
+    RANKING_PRIOR_MEAN, so a few high scores cannot outrank a title with
+    many slightly lower ones.
+    """
+    prior_votes = settings.RANKING_MIN_REVIEWS
+    prior = prior_votes * settings.RANKING_PRIOR_MEAN
+    return (Cast(score_sum, FloatField()) + prior) / (
+        review_count + prior_votes
+    )
+
+
+def default_weighted_rating():
+    return float(settings.RANKING_PRIOR_MEAN)
+
+
+class TitleStatsQuerySet(models.QuerySet):
+    """QuerySet maintaining score histograms of titles."""
+
+    def add_score(self, title_id, score, delta):
+        """Shift the histogram bucket of a score by ``delta`` reviews."""
+        field = f"score_{score}"
+        if field not in self.model.SCORE_FIELDS:
+            return
+        increment = {field: F(field) + delta}
+        if self.filter(title_id=title_id).update(**increment) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                self.create(title_id=title_id, **{field: delta})
+        except IntegrityError:
+            # Created by a concurrent review of the same title.
+            self.filter(title_id=title_id).update(**increment)
+
+    def rebuild(self, titles):
+        """Recalculate histograms of the given titles from their reviews."""
+        review_model = apps.get_model("api", "Review")
+        title_ids = titles.values("pk")
+        buckets = {
+            field: Count("pk", filter=Q(score=score))
+            for score, field in enumerate(self.model.SCORE_FIELDS, 1)
+        }
+        rows = (
+            review_model.objects.filter(title__in=title_ids)
+            .order_by()
+            .values("title_id")
+            .annotate(**buckets)
+        )
+        with transaction.atomic():
+            self.filter(title__in=title_ids).delete()
+            self.bulk_create(self.model(**row) for row in rows)
+        return len(rows)
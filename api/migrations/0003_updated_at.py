@@ -0,0 +1,44 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:24
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_from_pub_date(apps, schema_editor):
+    for model_name in ('Review', 'Comment'):
+        model = apps.get_model('api', model_name)
+        model.objects.update(updated_at=F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='update date'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='update date'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='update date'),
+        ),
+        migrations.RunPython(start_from_pub_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'updated_at'], name='api_comment_review__8d30d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'updated_at'], name='api_review_title_i_afa5e6_idx'),
+        ),
+    ]
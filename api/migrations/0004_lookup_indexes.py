@@ -0,0 +1,95 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:25
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+# Expression and trigram indexes for TitleFilter lookups: ``iexact`` is
+# compiled to UPPER(column::text) and ``contains`` to LIKE '%...%'.
+POSTGRES_INDEXES = (
+    ('api_category_slug_upper_idx',
+     'ON api_category (UPPER(slug::text))'),
+    ('api_genre_slug_upper_idx',
+     'ON api_genre (UPPER(slug::text))'),
+    ('api_title_name_trgm_idx',
+     'ON api_title USING gin (name gin_trgm_ops)'),
+)
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    """
+    Keep the first review of an author for a title, so the unique
+    constraint can be added, and recount ratings of the titles affected.
+    """
+    Title = apps.get_model('api', 'Title')
+    Review = apps.get_model('api', 'Review')
+    duplicates = list(
+        Review.objects.order_by().values('title', 'author')
+        .annotate(first=Min('pk'), count=Count('pk'))
+        .filter(count__gt=1)
+    )
+    for group in duplicates:
+        Review.objects.filter(
+            title=group['title'], author=group['author'],
+            pk__gt=group['first'],
+        ).delete()
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk')).order_by().values('title')
+    )
+    Title.objects.filter(
+        pk__in={group['title'] for group in duplicates}
+    ).update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(value=Count('pk')).values('value')), 0
+        ),
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')), 0
+        ),
+        rating=Subquery(reviews.annotate(value=Avg('score')).values('value')),
+    )
+    if schema_editor.connection.vendor == 'postgresql':
+        # Deferred foreign key checks of the deleted rows would make
+        # PostgreSQL refuse the ALTER TABLE of the constraint.
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        schema_editor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+
+def create_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, definition in POSTGRES_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} {definition}')
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in POSTGRES_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-id'], name='api_comment_review__b62525_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-id'], name='api_review_title_i_98f63a_idx'),
+        ),
+        migrations.RunPython(
+            delete_duplicate_reviews, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('title', 'author'), name='unique_title_author_review'),
+        ),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:28
+
+from django.db import migrations
+
+# The column is generated by PostgreSQL from name and description, so every
+# write path (ORM, bulk_create, imports) keeps it current. Other databases
+# fall back to substring search, see api.search.
+CREATE_SEARCH_VECTOR = """
+ALTER TABLE api_title ADD COLUMN search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('russian', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+) STORED
+"""
+CREATE_SEARCH_INDEX = (
+    'CREATE INDEX api_title_search_vector_idx '
+    'ON api_title USING gin (search_vector)'
+)
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_SEARCH_VECTOR)
+    schema_editor.execute(CREATE_SEARCH_INDEX)
+
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE api_title DROP COLUMN IF EXISTS search_vector'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
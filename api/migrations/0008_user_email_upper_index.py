@@ -0,0 +1,63 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+# Confirmation code requests look users up with ``email__iexact``, which
+# PostgreSQL compiles to UPPER(email::text). The index is unique, so two
+# users can not differ in the case of their email only; SQLite gets it for
+# the constraint alone.
+INDEX_NAME = 'api_user_email_upper_idx'
+INDEX_COLUMNS = {
+    'postgresql': 'UPPER(email::text)',
+    'sqlite': 'UPPER(email)',
+}
+
+
+def disable_duplicate_emails(apps, schema_editor):
+    """
+    Keep the first user of every email differing only in case.
+
+    Later ones could not sign in anyway, the email lookup failed on them.
+    They are deactivated and their email is prefixed with their id, so
+    their reviews and comments stay.
+    """
+    User = apps.get_model('api', 'User')
+    emails = (
+        User.objects.order_by().annotate(key=Upper('email')).values('key')
+        .annotate(count=Count('id')).filter(count__gt=1)
+    )
+    duplicates = []
+    for email in emails:
+        users = User.objects.filter(email__iexact=email['key'])
+        for user in users.order_by('id')[1:]:
+            user.email = f'duplicate-{user.id}-{user.email}'[:254]
+            user.is_active = False
+            duplicates.append(user)
+    User.objects.bulk_update(duplicates, ['email', 'is_active'])
+
+
+def create_email_index(apps, schema_editor):
+    column = INDEX_COLUMNS.get(schema_editor.connection.vendor)
+    if column is None:
+        return
+    disable_duplicate_emails(apps, schema_editor)
+    schema_editor.execute(
+        f'CREATE UNIQUE INDEX {INDEX_NAME} ON api_user ({column})'
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in INDEX_COLUMNS:
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_outbox_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
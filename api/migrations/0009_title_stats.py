@@ -0,0 +1,47 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:43
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def fill_title_stats(apps, schema_editor):
+    TitleStats = apps.get_model('api', 'TitleStats')
+    Review = apps.get_model('api', 'Review')
+    buckets = {
+        f'score_{score}': Count('pk', filter=Q(score=score))
+        for score in range(1, 11)
+    }
+    rows = Review.objects.order_by().values('title_id').annotate(**buckets)
+    TitleStats.objects.bulk_create(TitleStats(**row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.Title')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='reviews scored 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='reviews scored 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='reviews scored 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='reviews scored 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='reviews scored 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='reviews scored 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='reviews scored 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='reviews scored 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='reviews scored 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='reviews scored 10')),
+            ],
+            options={
+                'verbose_name': 'title stats',
+                'verbose_name_plural': 'title stats',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:45
+
+from datetime import timedelta
+
+import api.manager
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def fill_title_rankings(apps, schema_editor):
+    Title = apps.get_model('api', 'Title')
+    Review = apps.get_model('api', 'Review')
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk')).order_by().values('title')
+    )
+    recent_reviews = reviews.filter(
+        pub_date__gte=timezone.now() - timedelta(
+            days=settings.RANKING_RECENT_DAYS
+        )
+    )
+    Title.objects.update(
+        weighted_rating=api.manager.weighted_rating(
+            F('review_count'), F('score_sum')
+        ),
+        recent_review_count=Coalesce(
+            Subquery(
+                recent_reviews.annotate(value=Count('pk')).values('value')
+            ),
+            0,
+        ),
+        last_reviewed_at=Subquery(
+            reviews.annotate(value=Max('pub_date')).values('value')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_title_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='last_reviewed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='last review date'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='recent_review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='recent review count'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=api.manager.default_weighted_rating, editable=False, verbose_name='weighted rating'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', '-id'], name='api_title_weighte_0320ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-review_count', '-id'], name='api_title_review__5e6f38_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-recent_review_count', '-id'], name='api_title_recent__556cfc_idx'),
+        ),
+        migrations.RunPython(fill_title_rankings, migrations.RunPython.noop),
+    ]
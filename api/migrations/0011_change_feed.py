@@ -0,0 +1,32 @@
+# Generated by Django 3.0.8 on 2026-10-18 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_title_rankings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False, verbose_name='sequence number')),
+                ('model', models.CharField(max_length=20, verbose_name='model name')),
+                ('object_id', models.CharField(max_length=50, verbose_name='object key')),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10, verbose_name='action')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='change date')),
+            ],
+            options={
+                'verbose_name': 'change',
+                'verbose_name_plural': 'changes',
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['model', 'seq'], name='api_change_model_dc86b7_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.0.8 on 2026-10-18 05:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def number_existing_changes(apps, schema_editor):
+    # Entries written so far keep their numbers, so clients go on from
+    # the last_seq they have.
+    Change = apps.get_model('api', 'Change')
+    Change.objects.update(seq=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_change_feed'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='change',
+            name='api_change_model_dc86b7_idx',
+        ),
+        migrations.RenameField(
+            model_name='change',
+            old_name='seq',
+            new_name='id',
+        ),
+        migrations.AlterField(
+            model_name='change',
+            name='id',
+            field=models.BigAutoField(primary_key=True, serialize=False),
+        ),
+        migrations.AddField(
+            model_name='change',
+            name='seq',
+            field=models.BigIntegerField(editable=False, null=True, unique=True, verbose_name='sequence number'),
+        ),
+        migrations.RunPython(
+            number_existing_changes, migrations.RunPython.noop
+        ),
+        migrations.AlterModelOptions(
+            name='change',
+            options={'ordering': ['id'], 'verbose_name': 'change', 'verbose_name_plural': 'changes'},
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['model', 'seq'], name='api_change_model_dc86b7_idx'),
+        ),
+    ]
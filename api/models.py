@@ -3,8 +3,14 @@ from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
-
-from .manager import UserManager
+from django.utils import timezone
+
+from .manager import (
+    TitleQuerySet,
+    TitleStatsQuerySet,
+    UserManager,
+    default_weighted_rating,
+)
 from .validators import not_me_validator, less_than_current
 
 
@@ -49,11 +55,32 @@ class User(AbstractBaseUser, PermissionsMixin):
         choices=Roles.choices,
         default=Roles.USER,
     )
+    token_version = models.PositiveIntegerField(
+        verbose_name="token version", default=0, editable=False
+    )
 
     objects = UserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
+    # Issued tokens carry these fields, a change revokes them.
+    TOKEN_STATE_FIELDS = ("username", "role", "is_staff", "is_active")
+
+    _token_state = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_token_state()
+        return instance
+
+    def get_token_state(self):
+        return {field: self.__dict__.get(field)
+                for field in self.TOKEN_STATE_FIELDS}
+
+    def remember_token_state(self):
+        """Store values the issued tokens were built from."""
+        self._token_state = self.get_token_state()
 
     @property
     def is_admin(self):
@@ -119,6 +146,32 @@ class Title(models.Model):
         blank=True,
         null=True,
     )
+    rating = models.FloatField(
+        verbose_name="title rating", blank=True, null=True, editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name="review count", default=0, editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name="review score sum", default=0, editable=False
+    )
+    weighted_rating = models.FloatField(
+        verbose_name="weighted rating",
+        default=default_weighted_rating,
+        editable=False,
+    )
+    recent_review_count = models.PositiveIntegerField(
+        verbose_name="recent review count", default=0, editable=False
+    )
+    last_reviewed_at = models.DateTimeField(
+        verbose_name="last review date", blank=True, null=True,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="update date", auto_now=True
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -127,6 +180,12 @@ class Title(models.Model):
         verbose_name = "title"
         verbose_name_plural = "titles"
         ordering = ["-id"]
+        # Leaderboards break ties by id, so pages are read in index order.
+        indexes = [
+            models.Index(fields=["-weighted_rating", "-id"]),
+            models.Index(fields=["-review_count", "-id"]),
+            models.Index(fields=["-recent_review_count", "-id"]),
+        ]
 
 
 class Review(models.Model):
@@ -146,11 +205,39 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         verbose_name="publication date", auto_now_add=True, db_index=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name="update date", auto_now=True
+    )
+
+    _rated_title_id = None
+    _rated_score = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_state()
+        return instance
+
+    def remember_rating_state(self):
+        """Store values the title rating was last calculated with."""
+        self._rated_title_id = self.__dict__.get("title_id")
+        self._rated_score = self.__dict__.get("score")
 
     class Meta:
         verbose_name = "review"
         verbose_name_plural = "reviews"
         ordering = ["-id"]
+        # Page number lists are read by -id, cursor lists by -pub_date.
+        indexes = [
+            models.Index(fields=["title", "updated_at"]),
+            models.Index(fields=["title", "-id"]),
+            models.Index(fields=["title", "-pub_date"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["title", "author"], name="unique_title_author_review"
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -166,6 +253,156 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         verbose_name="publication date", auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name="update date", auto_now=True
+    )
 
     class Meta:
         ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["review", "updated_at"]),
+            models.Index(fields=["review", "-id"]),
+            models.Index(fields=["review", "-pub_date"]),
+        ]
+
+
+class TitleStats(models.Model):
+    """Score histogram of a title, kept up to date by review signals."""
+
+    SCORE_FIELDS = tuple(f"score_{score}" for score in range(1, 11))
+
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name="stats",
+    )
+    score_1 = models.PositiveIntegerField(
+        verbose_name="reviews scored 1", default=0
+    )
+    score_2 = models.PositiveIntegerField(
+        verbose_name="reviews scored 2", default=0
+    )
+    score_3 = models.PositiveIntegerField(
+        verbose_name="reviews scored 3", default=0
+    )
+    score_4 = models.PositiveIntegerField(
+        verbose_name="reviews scored 4", default=0
+    )
+    score_5 = models.PositiveIntegerField(
+        verbose_name="reviews scored 5", default=0
+    )
+    score_6 = models.PositiveIntegerField(
+        verbose_name="reviews scored 6", default=0
+    )
+    score_7 = models.PositiveIntegerField(
+        verbose_name="reviews scored 7", default=0
+    )
+    score_8 = models.PositiveIntegerField(
+        verbose_name="reviews scored 8", default=0
+    )
+    score_9 = models.PositiveIntegerField(
+        verbose_name="reviews scored 9", default=0
+    )
+    score_10 = models.PositiveIntegerField(
+        verbose_name="reviews scored 10", default=0
+    )
+
+    objects = TitleStatsQuerySet.as_manager()
+
+    @property
+    def scores(self):
+        return {
+            score: getattr(self, field)
+            for score, field in enumerate(self.SCORE_FIELDS, 1)
+        }
+
+    @property
+    def review_count(self):
+        return sum(self.scores.values())
+
+    @property
+    def rating(self):
+        count = self.review_count
+        if not count:
+            return None
+        return sum(score * n for score, n in self.scores.items()) / count
+
+    class Meta:
+        verbose_name = "title stats"
+        verbose_name_plural = "title stats"
+
+
+class OutboxEmail(models.Model):
+    """Email waiting for delivery by the send_outbox command."""
+
+    class Statuses(models.TextChoices):
+        PENDING = "pending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    subject = models.CharField(verbose_name="subject", max_length=255)
+    message = models.TextField(verbose_name="message")
+    from_email = models.EmailField(verbose_name="sender")
+    recipient = models.EmailField(verbose_name="recipient")
+    status = models.CharField(
+        verbose_name="status",
+        max_length=10,
+        choices=Statuses.choices,
+        default=Statuses.PENDING,
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name="delivery attempts", default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name="next attempt date", default=timezone.now
+    )
+    last_error = models.TextField(verbose_name="last error", blank=True)
+    created_at = models.DateTimeField(
+        verbose_name="creation date", auto_now_add=True
+    )
+    sent_at = models.DateTimeField(
+        verbose_name="delivery date", blank=True, null=True
+    )
+
+    class Meta:
+        verbose_name = "outbox email"
+        verbose_name_plural = "outbox emails"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+
+class Change(models.Model):
+    """
+    Entry of the append-only change feed read by downstream consumers.
+
+    ``seq`` is given after the writing transaction commits, in commit
+    order, see api.changes.number_changes. Entries without it are not
+    served yet.
+    """
+
+    class Actions(models.TextChoices):
+        CREATED = "created"
+        UPDATED = "updated"
+        DELETED = "deleted"
+
+    id = models.BigAutoField(primary_key=True)
+    seq = models.BigIntegerField(
+        verbose_name="sequence number", unique=True, null=True, editable=False
+    )
+    model = models.CharField(verbose_name="model name", max_length=20)
+    object_id = models.CharField(verbose_name="object key", max_length=50)
+    action = models.CharField(
+        verbose_name="action", max_length=10, choices=Actions.choices
+    )
+    created_at = models.DateTimeField(
+        verbose_name="change date", auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = "change"
+        verbose_name_plural = "changes"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["model", "seq"]),
+        ]
@@ -0,0 +1,39 @@
+from rest_framework.generics import get_object_or_404
+
+
+class NestedViewSetMixin:
+    """
+    Resolve parent objects of nested routes at most once per request.
+
+    ``parent_filter`` maps child queryset lookups to URL kwargs, so lists
+    and detail lookups check the parents in the same query. Parents listed
+    in ``parent_lookups`` as ``name: (model, {field: url_kwarg})`` are only
+    fetched when a view needs them, e.g. to create a child or to tell an
+    empty page from a missing parent.
+    """
+
+    parent_lookups = {}
+    parent_filter = {}
+
+    def get_parent(self, name):
+        parents = self.__dict__.setdefault("_parents", {})
+        if name not in parents:
+            model, lookups = self.parent_lookups[name]
+            parents[name] = get_object_or_404(model, **{
+                field: self.kwargs.get(url_kwarg)
+                for field, url_kwarg in lookups.items()
+            })
+        return parents[name]
+
+    def filter_by_parents(self, queryset):
+        return queryset.filter(**{
+            lookup: self.kwargs.get(url_kwarg)
+            for lookup, url_kwarg in self.parent_filter.items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            for name in self.parent_lookups:
+                self.get_parent(name)
+        return page
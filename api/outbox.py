@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+Statuses = OutboxEmail.Statuses
+
+
+def enqueue_email(subject, message, recipient, from_email=None):
+    """Store an email for the send_outbox command instead of sending it."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.FROM_EMAIL,
+        recipient=recipient,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts."""
+    delay = settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_batch(batch_size):
+    """
+    Take due emails for delivery and count the attempt.
+
+    Claimed rows are pushed OUTBOX_CLAIM_TIMEOUT seconds ahead, so other
+    workers skip them, and come back by themselves if this worker dies
+    before recording the outcome. The lock is only held for the claim.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(
+            status=Statuses.PENDING, next_attempt_at__lte=now
+        )
+        emails = list(
+            due.select_for_update(skip_locked=True)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        claimed_until = now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = claimed_until
+        OutboxEmail.objects.bulk_update(
+            emails, ["attempts", "next_attempt_at"]
+        )
+    return emails
+
+
+def send_batch(batch_size=None):
+    """
+    Deliver due outbox emails over a single mail connection.
+
+    The outcome of every email is saved right after it is sent, so a
+    crash in the middle of a batch sends no email twice, except the one
+    being sent. Returns numbers of sent and failed emails.
+    """
+    emails = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    sent = failed = 0
+    if not emails:
+        return sent, failed
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except OSError:
+        # Nothing was attempted, the emails are due again right away.
+        for email in emails:
+            email.attempts -= 1
+            email.next_attempt_at = timezone.now()
+        OutboxEmail.objects.bulk_update(
+            emails, ["attempts", "next_attempt_at"]
+        )
+        raise
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                failed += 1
+                email.last_error = repr(error)
+                if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    email.status = Statuses.FAILED
+                else:
+                    email.next_attempt_at = (
+                        timezone.now() + retry_delay(email.attempts)
+                    )
+            else:
+                sent += 1
+                email.status = Statuses.SENT
+                email.sent_at = timezone.now()
+            email.save(update_fields=[
+                "status", "next_attempt_at", "last_error", "sent_at"
+            ])
+    finally:
+        connection.close()
+    return sent, failed
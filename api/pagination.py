@@ -0,0 +1,90 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    Page number pagination with opt-in cursor mode.
+
+    Passing ``pagination=cursor`` switches to keyset pagination ordered by
+    the view ``cursor_ordering``: no COUNT query and no OFFSET scans, only
+    constant-time next/previous links. The cursor ordering replaces the
+    one of the queryset, so views reject lookups whose ordering matters,
+    such as ranked title search.
+    """
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode != self.cursor_mode:
+            self.cursor_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = CursorPagination()
+        self.cursor_paginator.ordering = getattr(
+            view, "cursor_ordering", "-id"
+        )
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class SequencePagination(BasePagination):
+    """
+    Keyset pagination over the ``seq`` of change feed entries.
+
+    ``after`` is the last sequence number the client has processed. The
+    response carries ``last_seq`` to pass next time and a ``next`` link
+    while more entries are waiting.
+    """
+
+    after_query_param = "after"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        after = request.query_params.get(self.after_query_param, 0)
+        try:
+            self.after = int(after)
+        except ValueError:
+            self.after = -1
+        if self.after < 0:
+            raise serializers.ValidationError({
+                self.after_query_param: ["Pass the last seen sequence number."]
+            })
+        self.request = request
+        self.page_size = settings.CHANGE_FEED_PAGE_SIZE
+        entries = queryset.filter(seq__gt=self.after).order_by("seq")
+        # One extra entry tells whether another page is waiting.
+        self.page = list(entries[:self.page_size + 1])
+        self.has_next = len(self.page) > self.page_size
+        self.page = self.page[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        last_seq = self.page[-1].seq if self.page else self.after
+        next_url = None
+        if self.has_next:
+            next_url = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.after_query_param,
+                last_seq,
+            )
+        return Response({
+            "last_seq": last_seq,
+            "next": next_url,
+            "results": data,
+        })
@@ -0,0 +1,72 @@
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
+from django.db import connections
+from django.db.models import (
+    BooleanField,
+    Case,
+    Func,
+    IntegerField,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.expressions import RawSQL
+
+# Text search configuration of the generated api_title.search_vector column,
+# see migration 0005_title_search.
+SEARCH_CONFIG = "russian"
+
+
+class SearchMatch(Func):
+    """Boolean ``vector @@ query`` expression usable in filter()."""
+
+    template = "%(expressions)s"
+    arg_joiner = " @@ "
+    output_field = BooleanField()
+
+
+def search_titles(queryset, value):
+    """Filter titles matching ``value`` and order them by relevance."""
+    if connections[queryset.db].vendor == "postgresql":
+        return _search_postgresql(queryset, value)
+    return _search_fallback(queryset, value)
+
+
+def _search_postgresql(queryset, value):
+    vector = RawSQL(
+        f'"{queryset.model._meta.db_table}"."search_vector"',
+        (),
+        output_field=SearchVectorField(),
+    )
+    query = SearchQuery(value, config=SEARCH_CONFIG)
+    return (
+        queryset.filter(SearchMatch(vector, query))
+        .annotate(rank=SearchRank(vector, query))
+        .order_by("-rank", "-id")
+    )
+
+
+def _search_fallback(queryset, value):
+    """Substring match for databases without text search, e.g. SQLite."""
+    terms = value.split()
+    if not terms:
+        return queryset
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+    rank = reduce(add, (
+        Case(
+            When(name__icontains=term, then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+        for term in terms
+    ))
+    return queryset.annotate(rank=rank).order_by("-rank", "-id")
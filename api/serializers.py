@@ -1,9 +1,18 @@
-from rest_framework import exceptions, serializers
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import User, Category, Genre, Title, Review, Comment
+from .authentication import add_user_claims
+from .models import (User, Category, Change, Genre, Title, TitleStats,
+                     Review, Comment)
+from .tokens import confirmation_code_generator
 
 
 class CustomTokenObtainSerializer(serializers.Serializer):
@@ -19,10 +28,14 @@ class CustomTokenObtainSerializer(serializers.Serializer):
         self.fields['confirmation_code'] = serializers.CharField()
 
     def validate(self, attrs):
-        self.user = get_object_or_404(User, email=attrs[self.username_field])
+        self.user = get_object_or_404(
+            User, email__iexact=attrs[self.username_field]
+        )
 
-        if not self.user:
-            raise exceptions.AuthenticationFailed('The user is not valid.')
+        if not confirmation_code_generator.check_code(
+                self.user, attrs['confirmation_code']
+        ):
+            raise InvalidToken()
 
         return {}
 
@@ -31,12 +44,14 @@ class CustomTokenObtainPairSerializer(CustomTokenObtainSerializer):
     """Serializer for token obtaining."""
     @classmethod
     def get_token(cls, user):
-        return RefreshToken.for_user(user)
+        return add_user_claims(RefreshToken.for_user(user), user)
 
     def validate(self, attrs):
         data = super(CustomTokenObtainPairSerializer, self).validate(attrs)
 
         refresh = self.get_token(self.user)
+        # A new last_login invalidates the code, so it works only once.
+        User.objects.filter(pk=self.user.pk).update(last_login=timezone.now())
 
         data['refresh'] = str(refresh)
         data['access'] = str(refresh.access_token)
@@ -44,12 +59,23 @@ class CustomTokenObtainPairSerializer(CustomTokenObtainSerializer):
         return data
 
 
-class CreateUserSerializer(serializers.ModelSerializer):
-    """Serializer for user creation action."""
+class CreateUserSerializer(serializers.Serializer):
+    """Serializer for confirmation code requests."""
 
-    class Meta:
-        fields = ("email",)
-        model = User
+    email = serializers.EmailField(max_length=254)
+
+    def create(self, validated_data):
+        """Return the user with the email, creating one if needed."""
+        email = validated_data["email"]
+        user = User.objects.filter(email__iexact=email).first()
+        if user is not None:
+            return user
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(email=email)
+        except IntegrityError:
+            # Created by a concurrent request.
+            return User.objects.get(email__iexact=email)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -60,7 +86,9 @@ class UserSerializer(serializers.ModelSerializer):
         required=True,
     )
     email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
+        validators=[
+            UniqueValidator(queryset=User.objects.all(), lookup="iexact")
+        ],
         required=True,
     )
 
@@ -86,7 +114,9 @@ class AdminSerializer(serializers.ModelSerializer):
         required=True,
     )
     email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
+        validators=[
+            UniqueValidator(queryset=User.objects.all(), lookup="iexact")
+        ],
         required=True,
     )
 
@@ -133,7 +163,15 @@ class GetTitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True, default=None)
 
     class Meta:
-        fields = "__all__"
+        fields = (
+            "id",
+            "name",
+            "genre",
+            "category",
+            "rating",
+            "year",
+            "description",
+        )
         model = Title
 
 
@@ -153,10 +191,32 @@ class CreateTitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True, default=None)
 
     class Meta:
-        fields = "__all__"
+        fields = (
+            "id",
+            "name",
+            "genre",
+            "category",
+            "rating",
+            "year",
+            "description",
+        )
         model = Title
 
 
+@contextmanager
+def unique_review():
+    """Rely on the unique constraint to reject a second review."""
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError:
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                "Authors review already exists"
+            ]
+        })
+
+
 class CreateReviewSerializer(serializers.ModelSerializer):
     """Serializer for title POST endpoints."""
 
@@ -169,22 +229,15 @@ class CreateReviewSerializer(serializers.ModelSerializer):
         read_only=True,
         default=serializers.CurrentUserDefault(),
     )
-    title = serializers.SlugRelatedField(
-        required=False, slug_field="pk", queryset=Title.objects.all()
-    )
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
-        fields = "__all__"
+        exclude = ("updated_at",)
         model = Review
 
-    def validate(self, data):
-        """Check that authors review already exists."""
-        title = self.context["view"].kwargs.get("title_id")
-        author = self.context["request"].user
-        message = "Authors review already exists"
-        if Review.objects.filter(title=title, author=author).exists():
-            raise serializers.ValidationError(message)
-        return data
+    def create(self, validated_data):
+        with unique_review():
+            return super().create(validated_data)
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -199,14 +252,19 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True,
         default=serializers.CurrentUserDefault(),
     )
-    title = serializers.SlugRelatedField(
-        required=False, slug_field="pk", queryset=Title.objects.all()
+    title = serializers.PrimaryKeyRelatedField(
+        required=False, queryset=Title.objects.all()
     )
 
     class Meta:
-        fields = "__all__"
+        exclude = ("updated_at",)
         model = Review
 
+    def update(self, instance, validated_data):
+        # Moving the review to a title the author has reviewed.
+        with unique_review():
+            return super().update(instance, validated_data)
+
 
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer for comment endpoints."""
@@ -220,10 +278,30 @@ class CommentSerializer(serializers.ModelSerializer):
     title = serializers.SlugRelatedField(
         required=False, slug_field="pk", queryset=Title.objects.all()
     )
-    review = serializers.SlugRelatedField(
-        required=False, slug_field="pk", queryset=Review.objects.all()
+    review = serializers.PrimaryKeyRelatedField(
+        required=False, queryset=Review.objects.all()
     )
 
     class Meta:
-        fields = "__all__"
+        exclude = ("updated_at",)
         model = Comment
+
+
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Serializer for title score histogram."""
+
+    review_count = serializers.ReadOnlyField()
+    rating = serializers.ReadOnlyField()
+    scores = serializers.ReadOnlyField()
+
+    class Meta:
+        fields = ("title", "review_count", "rating", "scores")
+        model = TitleStats
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    """Serializer for change feed entries."""
+
+    class Meta:
+        fields = ("seq", "model", "object_id", "action", "created_at")
+        model = Change
@@ -0,0 +1,216 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Now
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .authentication import token_version_key
+from .cache import bump_versions
+from .changes import Actions, record_change, record_changes
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleStats,
+    User,
+)
+
+
+def is_recent(review):
+    """Return 1 for a review inside the trending window, 0 otherwise."""
+    since = timezone.now() - timedelta(days=settings.RANKING_RECENT_DAYS)
+    return int(review.pub_date >= since)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    """Apply created or re-scored review to stored title statistics."""
+    if raw:
+        return
+    if created:
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            count=1,
+            score=instance.score,
+            recent=is_recent(instance),
+            reviewed_at=instance.pub_date,
+        )
+        TitleStats.objects.add_score(instance.title_id, instance.score, 1)
+    elif instance._rated_score is None:
+        titles = Title.objects.filter(pk=instance.title_id)
+        titles.refresh_rating()
+        TitleStats.objects.rebuild(titles)
+    elif instance._rated_title_id != instance.title_id:
+        Title.objects.filter(pk=instance._rated_title_id).apply_review_delta(
+            count=-1, score=-instance._rated_score, recent=-is_recent(instance)
+        )
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            count=1,
+            score=instance.score,
+            recent=is_recent(instance),
+            reviewed_at=instance.pub_date,
+        )
+        TitleStats.objects.add_score(
+            instance._rated_title_id, instance._rated_score, -1
+        )
+        TitleStats.objects.add_score(instance.title_id, instance.score, 1)
+    elif instance._rated_score != instance.score:
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            count=0, score=instance.score - instance._rated_score
+        )
+        TitleStats.objects.add_score(
+            instance.title_id, instance._rated_score, -1
+        )
+        TitleStats.objects.add_score(instance.title_id, instance.score, 1)
+    instance.remember_rating_state()
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Withdraw deleted review from the stored title rating."""
+    Title.objects.filter(pk=instance.title_id).apply_review_delta(
+        count=-1, score=-instance.score, recent=-is_recent(instance)
+    )
+    TitleStats.objects.add_score(instance.title_id, instance.score, -1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_cached_responses(sender, **kwargs):
+    """Make cached responses built from the changed model unreachable."""
+    bump_versions(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_cached_titles(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_versions(Title)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_authors(sender, created=False, **kwargs):
+    """Refresh cached author usernames; a new user has no reviews yet."""
+    if not created:
+        bump_versions(User)
+
+
+@receiver(post_save, sender=User)
+def touch_authored_posts(sender, instance, created, raw, **kwargs):
+    """Reviews and comments render their author's username."""
+    if raw or created:
+        return
+    # Runs before revoke_outdated_tokens() remembers the new state.
+    if (instance._token_state or {}).get("username") == instance.username:
+        return
+    # Not Now(): SQLite's CURRENT_TIMESTAMP drops the fraction of a
+    # second and could sort before the current updated_at values.
+    for model in (Review, Comment):
+        posts = model.objects.filter(author=instance)
+        record_changes(model, posts.values_list("pk", flat=True))
+        posts.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, created=False, **kwargs):
+    """Titles render their category, so renaming it changes them."""
+    if not created:
+        titles = Title.objects.filter(category=instance)
+        record_changes(Title, titles.values_list("pk", flat=True))
+        titles.update(updated_at=Now())
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, created=False, **kwargs):
+    if not created:
+        titles = Title.objects.filter(genre=instance)
+        record_changes(Title, titles.values_list("pk", flat=True))
+        titles.update(updated_at=Now())
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        titles = Title.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        titles = Title.objects.filter(genre=instance)
+    else:
+        titles = Title.objects.filter(pk__in=pk_set)
+    record_changes(Title, titles.values_list("pk", flat=True))
+    titles.update(updated_at=Now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def record_saved(sender, instance, created, raw, **kwargs):
+    """Append the saved object to the change feed."""
+    if not raw:
+        action = Actions.CREATED if created else Actions.UPDATED
+        record_change(instance, action)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def record_deleted(sender, instance, **kwargs):
+    """Leave a tombstone of the deleted object in the change feed."""
+    record_change(instance, Actions.DELETED)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def record_rated_title(sender, instance, raw=False, **kwargs):
+    """Title rating and review count follow its reviews."""
+    if not raw:
+        record_changes(Title, [instance.title_id])
+
+
+@receiver(post_save, sender=User)
+def revoke_outdated_tokens(sender, instance, created, raw, **kwargs):
+    """Move the token version on when claimed user fields change."""
+    if raw:
+        return
+    if not created and instance._token_state != instance.get_token_state():
+        User.objects.filter(pk=instance.pk).update(
+            token_version=F("token_version") + 1
+        )
+        instance.token_version = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("token_version", flat=True)
+            .get()
+        )
+        cache.delete(token_version_key(instance.pk))
+    instance.remember_token_state()
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    cache.delete(token_version_key(instance.pk))
@@ -0,0 +1,17 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class ConfirmationCodeThrottle(SimpleRateThrottle):
+    """Limit confirmation codes issued for one email address."""
+
+    scope = "confirmation_code"
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email")
+        if isinstance(email, str) and email.strip():
+            ident = hashlib.md5(email.strip().lower().encode()).hexdigest()
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
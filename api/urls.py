@@ -3,11 +3,13 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import UserViewSet, CategoryViewSet, GenreViewSet, TitleViewSet, \
-    ReviewViewSet, CommentViewSet, send_password, send_token
+    ReviewViewSet, CommentViewSet, send_password, send_token, \
+    TitleExportView, ReviewExportView, CommentExportView, ChangeViewSet
 
 
 router = DefaultRouter()
 router.register("users", UserViewSet)
+router.register("changes", ChangeViewSet, basename="change")
 router.register("categories", CategoryViewSet)
 router.register("genres", GenreViewSet)
 router.register("titles", TitleViewSet, basename="title")
@@ -40,6 +42,21 @@ urlpatterns = [
                     TokenRefreshView.as_view(),
                     name="token_refresh",
                 ),
+                path(
+                    "export/titles/",
+                    TitleExportView.as_view(),
+                    name="export_titles",
+                ),
+                path(
+                    "export/reviews/",
+                    ReviewExportView.as_view(),
+                    name="export_reviews",
+                ),
+                path(
+                    "export/comments/",
+                    CommentExportView.as_view(),
+                    name="export_comments",
+                ),
                 path("", include(router.urls)),
             ]
         ),
@@ -1,24 +1,35 @@
-from smtplib import SMTPException
-
-from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework import viewsets, mixins
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS, AllowAny
 from rest_framework.response import Response
-from rest_framework.status import HTTP_500_INTERNAL_SERVER_ERROR
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
-from rest_framework_simplejwt.exceptions import InvalidToken
 
-from api_yamdb.settings import FROM_EMAIL
-from .filters import TitleFilter
-from .models import Category, Genre, Title, Review, User
+from .bulk import (
+    BulkSlugSerializer,
+    BulkTitleSerializer,
+    BulkUpsertMixin,
+    upsert_slugged,
+    upsert_titles,
+)
+from .cache import CachedListMixin, CachedRetrieveMixin
+from .conditional import ConditionalGetMixin, ConditionalRetrieveMixin
+from .export import ExportView
+from .filters import TitleFilter, title_ordering
+from .nested import NestedViewSetMixin
+from .outbox import enqueue_email
+from .pagination import OptionalCursorPagination, SequencePagination
+from .models import (Category, Change, Comment, Genre, Title, TitleStats,
+                     Review, User)
 from .permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
@@ -29,33 +40,25 @@ from .serializers import (CategorySerializer, GenreSerializer,
                           CreateTitleSerializer, CreateReviewSerializer,
                           ReviewSerializer, CustomTokenObtainPairSerializer,
                           UserSerializer, CreateUserSerializer,
-                          AdminSerializer)
+                          AdminSerializer, TitleStatsSerializer,
+                          ChangeSerializer)
+from .throttling import ConfirmationCodeThrottle
+from .tokens import confirmation_code_generator
 
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((ConfirmationCodeThrottle,))
 def send_password(request):
     """View for mailing token"""
     serializer = CreateUserSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    serializer.save()
-    token_generator = PasswordResetTokenGenerator()
-    user = get_object_or_404(User, email=request.POST.get("email"))
-    password = token_generator.make_token(user=user)
-    try:
-        send_mail(
-            subject="Your password reset token",
-            message=password,
-            from_email=FROM_EMAIL,
-            recipient_list=[request.POST.get("email")],
-            fail_silently=False,
-        )
-    except SMTPException as e:
-        return Response(
-            data="There was an error sending an email.",
-            status=HTTP_500_INTERNAL_SERVER_ERROR,
-            exception=e,
-        )
+    user = serializer.save()
+    enqueue_email(
+        subject="Your password reset token",
+        message=confirmation_code_generator.make_code(user),
+        recipient=user.email,
+    )
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -64,15 +67,8 @@ def send_password(request):
 def send_token(request):
     """View for token obtaining"""
     serializer = CustomTokenObtainPairSerializer(data=request.data)
-    user = get_object_or_404(User, email=request.POST.get('email'))
-    token_generator = PasswordResetTokenGenerator()
-    if token_generator.check_token(
-            user=user,
-            token=request.data['confirmation_code']
-    ):
-        serializer.is_valid(raise_exception=True)
-        return Response(serializer.validated_data, status=status.HTTP_200_OK)
-    raise InvalidToken()
+    serializer.is_valid(raise_exception=True)
+    return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
 class UserViewSet(ModelViewSet):
@@ -106,7 +102,7 @@ class NotPatchViewSet(
     pass
 
 
-class CategoryViewSet(NotPatchViewSet):
+class CategoryViewSet(BulkUpsertMixin, CachedListMixin, NotPatchViewSet):
     """View set for category endpoints."""
 
     queryset = Category.objects.all()
@@ -116,9 +112,14 @@ class CategoryViewSet(NotPatchViewSet):
     filter_backends = [SearchFilter]
     search_fields = ["=name"]
     pagination_class = PageNumberPagination
+    cache_models = (Category,)
+    bulk_serializer_class = BulkSlugSerializer
 
+    def perform_bulk_upsert(self, items, errors):
+        upsert_slugged(Category, items, errors)
 
-class GenreViewSet(NotPatchViewSet):
+
+class GenreViewSet(BulkUpsertMixin, CachedListMixin, NotPatchViewSet):
     """View set for genre endpoints."""
 
     queryset = Genre.objects.all()
@@ -128,39 +129,85 @@ class GenreViewSet(NotPatchViewSet):
     filter_backends = [SearchFilter]
     search_fields = ["=name"]
     pagination_class = PageNumberPagination
+    cache_models = (Genre,)
+    bulk_serializer_class = BulkSlugSerializer
+
+    def perform_bulk_upsert(self, items, errors):
+        upsert_slugged(Genre, items, errors)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(BulkUpsertMixin, ConditionalRetrieveMixin,
+                   CachedRetrieveMixin, viewsets.ModelViewSet):
     """View set for title endpoints."""
 
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
+    pagination_class = OptionalCursorPagination
+    cache_models = (Title, Genre, Category, Review)
+    bulk_serializer_class = BulkTitleSerializer
+
+    @property
+    def cursor_ordering(self):
+        params = self.request.query_params
+        # A cursor needs a column ordering, the search rank is not one.
+        if "search" in params:
+            raise serializers.ValidationError({
+                "search": ["Search results can not be paged by cursor."]
+            })
+        return title_ordering(params.get("ordering")) or "-id"
 
     def get_queryset(self):
-        queryset = Title.objects.all().annotate(
-            rating=Avg("reviews_title__score")
+        return (
+            Title.objects.select_related("category")
+            .prefetch_related("genre")
+            .order_by("-id")
         )
-        return queryset.order_by("-id")
+
+    def get_validator_queryset(self):
+        return Title.objects.all()
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return GetTitleSerializer
         return CreateTitleSerializer
 
+    def perform_bulk_upsert(self, items, errors):
+        upsert_titles(items, errors)
+
+    @action(detail=True, methods=["GET"])
+    def stats(self, request, pk=None):
+        """Score histogram of the title, read from a single row."""
+        try:
+            stats = TitleStats.objects.get(title_id=pk)
+        except (TitleStats.DoesNotExist, ValueError):
+            stats = TitleStats(title=get_object_or_404(Title, pk=pk))
+        return Response(TitleStatsSerializer(stats).data)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(NestedViewSetMixin, ConditionalGetMixin,
+                    CachedRetrieveMixin, viewsets.ModelViewSet):
     """View set for review endpoints."""
 
     permission_classes = [IsModeratorOrOwnerOrReadOnly]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = "-pub_date"
+    cache_models = (Review, Title, User)
+    parent_lookups = {"title": (Title, {"pk": "title_id"})}
+    parent_filter = {"title_id": "title_id"}
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get("title_id"))
-        return title.reviews_title.all()
+        return self.filter_by_parents(
+            Review.objects.select_related("author")
+        )
+
+    def get_validator_queryset(self):
+        return self.filter_by_parents(Review.objects.all())
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get("title_id"))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(
+            author=self.request.user, title=self.get_parent("title")
+        )
 
     def get_serializer_class(self):
         if self.request.method != "POST":
@@ -168,24 +215,120 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return CreateReviewSerializer
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedViewSetMixin, ConditionalGetMixin,
+                     CachedRetrieveMixin, viewsets.ModelViewSet):
     """View set for comment endpoints."""
 
     serializer_class = CommentSerializer
     permission_classes = [IsModeratorOrOwnerOrReadOnly]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = "-pub_date"
+    cache_models = (Comment, Review, Title, User)
+    parent_lookups = {
+        "review": (Review, {"pk": "review_id", "title_id": "title_id"})
+    }
+    parent_filter = {"review_id": "review_id", "review__title_id": "title_id"}
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            title_id=self.kwargs.get("title_id"),
-            pk=self.kwargs.get("review_id")
+        serializer.save(
+            author=self.request.user, review=self.get_parent("review")
         )
-        serializer.save(author=self.request.user, review=review)
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            title_id=self.kwargs.get("title_id"),
-            pk=self.kwargs.get("review_id")
+        return self.filter_by_parents(
+            Comment.objects.select_related("author")
         )
-        return review.comments_review.all()
+
+    def get_validator_queryset(self):
+        return self.filter_by_parents(Comment.objects.all())
+
+
+class ChangeViewSet(mixins.ListModelMixin, GenericViewSet):
+    """
+    Change feed of titles, genres, categories, reviews and comments.
+
+    Only numbered entries are served: numbers are given in commit order,
+    so no entry can appear later below the last one a client has seen.
+    """
+
+    serializer_class = ChangeSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = SequencePagination
+
+    def get_queryset(self):
+        queryset = Change.objects.filter(seq__isnull=False)
+        model = self.request.query_params.get("model")
+        if model:
+            queryset = queryset.filter(model=model)
+        return queryset
+
+
+class TitleExportView(ExportView):
+    """Stream titles with their genres, category and rating."""
+
+    basename = "titles"
+    fields = {
+        "id": "id",
+        "name": "name",
+        "year": "year",
+        "description": "description",
+        "category": "category__slug",
+        "rating": "rating",
+        "review_count": "review_count",
+        "updated_at": "updated_at",
+    }
+
+    def get_queryset(self):
+        return Title.objects.all()
+
+    def get_field_names(self):
+        return [*self.fields, "genre"]
+
+    def add_relations(self, rows):
+        genres = {row["id"]: [] for row in rows}
+        links = (
+            Title.genre.through.objects.using(self.database)
+            .filter(title_id__in=genres)
+            .order_by("id")
+            .values_list("title_id", "genre__slug")
+        )
+        for title_id, slug in links:
+            genres[title_id].append(slug)
+        for row in rows:
+            row["genre"] = genres[row["id"]]
+        return rows
+
+
+class ReviewExportView(ExportView):
+    """Stream reviews of all titles."""
+
+    basename = "reviews"
+    fields = {
+        "id": "id",
+        "title": "title_id",
+        "author": "author__username",
+        "text": "text",
+        "score": "score",
+        "pub_date": "pub_date",
+        "updated_at": "updated_at",
+    }
+
+    def get_queryset(self):
+        return Review.objects.all()
+
+
+class CommentExportView(ExportView):
+    """Stream comments of all reviews."""
+
+    basename = "comments"
+    fields = {
+        "id": "id",
+        "review": "review_id",
+        "author": "author__username",
+        "text": "text",
+        "pub_date": "pub_date",
+        "updated_at": "updated_at",
+    }
+
+    def get_queryset(self):
+        return Comment.objects.all()
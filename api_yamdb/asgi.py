@@ -9,8 +9,48 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    Django's handler reading streaming responses off the event loop.
+
+    Django 3.0 iterates a streaming response on the event loop, where the
+    export views cannot run the queries of their next chunk. Parts are
+    read with sync_to_async instead, all in one thread, which keeps one
+    database connection for the whole response.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        parts = iter(response)
+        read_part = sync_to_async(next, thread_sensitive=True)
+        # Django sends the headers and the closing message, the body is
+        # sent here, right before the closing message.
+        response.streaming_content = ()
+
+        async def send_parts(message):
+            if (message['type'] == 'http.response.body'
+                    and not message.get('more_body')):
+                part = await read_part(parts, None)
+                while part is not None:
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+                    part = await read_part(parts, None)
+            await send(message)
+
+        await super().send_response(response, send_parts)
+
+
+django.setup(set_prefix=False)
+application = StreamingASGIHandler()
@@ -0,0 +1,36 @@
+"""
+Health checks of persistent database connections.
+
+Django reuses a connection for CONN_MAX_AGE seconds but notices that the
+server dropped it (a restart, a pooler or firewall timeout) only when a
+query fails. Connections idle for longer than DB_HEALTH_CHECK_INTERVAL are
+pinged at the start of a request and reopened if unusable.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+@receiver(request_started)
+def check_idle_connections(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        released_at = getattr(connection, 'released_at', now)
+        if now - released_at < settings.DB_HEALTH_CHECK_INTERVAL:
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+@receiver(request_finished)
+def remember_release_time(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.released_at = now
@@ -0,0 +1,196 @@
+"""
+Per-view request metrics.
+
+When METRICS_ENABLED is set, every request is timed together with the SQL
+it runs, through an execute wrapper on each database connection. Results
+are keyed by the resolved view name (title-list, review-detail, ...) and
+reported three ways: a Server-Timing header, one JSON log line on the
+api_yamdb.metrics logger and histograms served in the Prometheus text
+format by metrics_view. Histograms live in the memory of each process, so
+every gunicorn worker reports its own share of the requests.
+
+Timings tell a lot about the data behind a response, so Server-Timing is
+only added for requests sending METRICS_TOKEN in X-Metrics-Token. The
+histograms require the token when one is set, nginx only lets internal
+addresses reach them.
+
+Queries run while a streaming response is sent are not counted.
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED = 'unresolved'
+
+
+class QueryTimer:
+    """Execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        """Cumulative counts by upper bound, ending with +Inf."""
+        total = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """Histograms and counters of every view seen by this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def clear(self):
+        with self.lock:
+            self.views = {}
+
+    def observe(self, view, seconds, queries, sql_seconds, size):
+        with self.lock:
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = {
+                    'duration': Histogram(settings.METRICS_DURATION_BUCKETS),
+                    'queries': Histogram(settings.METRICS_QUERY_BUCKETS),
+                    'sql_seconds': 0.0,
+                    'response_bytes': 0,
+                }
+            stats['duration'].observe(seconds)
+            stats['queries'].observe(queries)
+            stats['sql_seconds'] += sql_seconds
+            stats['response_bytes'] += size or 0
+
+    def render(self):
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = []
+            for name, histogram, help_text in (
+                ('yamdb_request_duration_seconds', 'duration',
+                 'Wall time of requests.'),
+                ('yamdb_request_queries', 'queries',
+                 'SQL queries per request.'),
+            ):
+                lines += [
+                    f'# HELP {name} {help_text}',
+                    f'# TYPE {name} histogram',
+                ]
+                for view, stats in views:
+                    lines += histogram_lines(name, view, stats[histogram])
+            for name, counter, help_text in (
+                ('yamdb_request_sql_seconds_total', 'sql_seconds',
+                 'Time spent in SQL queries.'),
+                ('yamdb_response_bytes_total', 'response_bytes',
+                 'Size of non-streaming response bodies.'),
+            ):
+                lines += [
+                    f'# HELP {name} {help_text}',
+                    f'# TYPE {name} counter',
+                ]
+                for view, stats in views:
+                    lines.append(f'{name}{{view="{view}"}} {stats[counter]}')
+        return '\n'.join(lines) + '\n'
+
+
+def histogram_lines(name, view, histogram):
+    count = 0
+    for bound, count in histogram.samples():
+        yield f'{name}_bucket{{view="{view}",le="{bound}"}} {count}'
+    yield f'{name}_sum{{view="{view}"}} {histogram.sum}'
+    yield f'{name}_count{{view="{view}"}} {count}'
+
+
+registry = Registry()
+
+
+class RequestMetricsMiddleware:
+    """Measure requests when METRICS_ENABLED is set, else drop out."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        seconds = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED
+        size = None if response.streaming else len(response.content)
+        registry.observe(view, seconds, timer.count, timer.seconds, size)
+        if is_trusted(request):
+            response['Server-Timing'] = (
+                f'app;dur={seconds * 1000:.2f}, '
+                f'db;dur={timer.seconds * 1000:.2f};'
+                f'desc="{timer.count} queries"'
+            )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'view': view,
+                'method': request.method,
+                'status': response.status_code,
+                'duration_ms': round(seconds * 1000, 2),
+                'queries': timer.count,
+                'sql_ms': round(timer.seconds * 1000, 2),
+                'bytes': size,
+            }))
+        return response
+
+
+def is_trusted(request):
+    """Whether the request sends the configured METRICS_TOKEN."""
+    return bool(settings.METRICS_TOKEN) and constant_time_compare(
+        request.headers.get('X-Metrics-Token', ''), settings.METRICS_TOKEN
+    )
+
+
+def metrics_view(request):
+    """Histograms of this process in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if settings.METRICS_TOKEN and not is_trusted(request):
+        raise PermissionDenied
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,145 @@
+"""
+Detection of repeated and slow SQL queries.
+
+Queries of a request are recorded through an execute wrapper and checked
+for three problems:
+
+* structurally identical queries repeated QUERYCHECK_REPEAT_THRESHOLD
+  times or more, the usual sign of a per-row fetch (N+1);
+* more queries than the budget of the view, QUERYCHECK_BUDGETS or
+  QUERYCHECK_DEFAULT_BUDGET;
+* SELECTs slower than QUERYCHECK_EXPLAIN_MS, reported with their EXPLAIN
+  plan. Unset the setting to skip plans.
+
+Tests use record_queries() and find_problems() directly, staging turns
+on QueryCheckMiddleware with QUERYCHECK_ENABLED=1 to log the problems.
+"""
+
+import logging
+import re
+import time
+from collections import Counter, namedtuple
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+Query = namedtuple('Query', 'sql params seconds alias')
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+VALUE_LIST = re.compile(r'\((?:\s*(?:%s|\?|\d+)\s*,)+\s*(?:%s|\?|\d+)\s*\)')
+SPACES = re.compile(r'\s+')
+
+
+def normalize(sql):
+    """Replace literals and placeholder lists, keeping the query shape."""
+    sql = STRING.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    sql = VALUE_LIST.sub('(...)', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """Execute wrapper keeping every query with its duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(Query(
+                sql, params, time.perf_counter() - started,
+                context['connection'].alias,
+            ))
+
+
+@contextmanager
+def record_queries():
+    """Record queries on all database connections of this thread."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def repeated_queries(queries, threshold=None):
+    """Return ``(normalized sql, count)`` of query shapes seen too often."""
+    threshold = threshold or settings.QUERYCHECK_REPEAT_THRESHOLD
+    counts = Counter(normalize(query.sql) for query in queries)
+    return [
+        (sql, count) for sql, count in counts.items() if count >= threshold
+    ]
+
+
+def query_budget(view_name):
+    return settings.QUERYCHECK_BUDGETS.get(
+        view_name, settings.QUERYCHECK_DEFAULT_BUDGET
+    )
+
+
+def explain(query):
+    """Return the plan of a recorded SELECT as text."""
+    connection = connections[query.alias]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{connection.ops.explain_query_prefix()} {query.sql}',
+            query.params,
+        )
+        return '\n'.join(
+            ' '.join(str(value) for value in row) for row in cursor.fetchall()
+        )
+
+
+def find_problems(queries, view_name=None, budget=None):
+    """
+    Describe repeated queries, a blown budget and slow queries.
+
+    Must run after recording has stopped: plans of slow queries are
+    fetched with queries of their own.
+    """
+    problems = [
+        f'{count} queries like: {sql}'
+        for sql, count in repeated_queries(queries)
+    ]
+    budget = budget or query_budget(view_name)
+    if len(queries) > budget:
+        problems.append(f'{len(queries)} queries, the budget is {budget}')
+    if settings.QUERYCHECK_EXPLAIN_MS is not None:
+        for query in queries:
+            if (query.seconds * 1000 < settings.QUERYCHECK_EXPLAIN_MS
+                    or not query.sql.lstrip().upper().startswith('SELECT')):
+                continue
+            problems.append(
+                f'{query.seconds * 1000:.1f} ms: {query.sql}\n'
+                f'{explain(query)}'
+            )
+    return problems
+
+
+class QueryCheckMiddleware:
+    """Log query problems of every request when QUERYCHECK_ENABLED is set."""
+
+    def __init__(self, get_response):
+        if not settings.QUERYCHECK_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        for problem in find_problems(recorder.queries, view_name):
+            logger.warning(
+                '%s %s (%s): %s',
+                request.method, request.path, view_name, problem,
+            )
+        return response
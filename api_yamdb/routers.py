@@ -0,0 +1,105 @@
+"""
+Routing of reads to database replicas.
+
+Reads of a safe-method request go to one alias of REPLICA_DATABASES,
+picked at random when the request starts, so all its queries see the
+same replication state. Everything else uses the primary. A client
+that has just written keeps its reads on the primary for
+REPLICA_PIN_SECONDS, so it sees its own writes despite replication lag:
+the user id of its access token is pinned in the shared cache, and
+clients keeping cookies, anonymous ones included, also get a cookie.
+Code running outside a request, such as management commands, always uses
+the primary.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+PIN_COOKIE = 'use_primary'
+
+_replica = ContextVar('replica', default=None)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.REPLICA_DATABASES}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+def pin_key(user_id):
+    return f'api:replica-pin:{user_id}'
+
+
+def token_user_id(request):
+    """
+    User id of the request's access token, None without a valid one.
+
+    Only the signature and expiry are checked, the database is not
+    queried: authentication proper happens later, in the view.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except AuthenticationFailed:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        safe = request.method in ('GET', 'HEAD', 'OPTIONS')
+        user_id = token_user_id(request)
+        replica = None
+        if safe and not self.pinned(request, user_id):
+            replica = random.choice(settings.REPLICA_DATABASES)
+        token = _replica.set(replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        if not safe:
+            if user_id is not None:
+                cache.set(
+                    pin_key(user_id), True, settings.REPLICA_PIN_SECONDS
+                )
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    @staticmethod
+    def pinned(request, user_id):
+        if PIN_COOKIE in request.COOKIES:
+            return True
+        return user_id is not None and bool(cache.get(pin_key(user_id)))
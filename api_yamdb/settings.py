@@ -47,6 +47,9 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'api.User'
 
 MIDDLEWARE = [
+    'api_yamdb.metrics.RequestMetricsMiddleware',
+    'api_yamdb.querycheck.QueryCheckMiddleware',
+    'api_yamdb.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,9 +92,64 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': os.environ.get('DB_PORT'),
+        # Seconds a connection is kept between requests, 0 closes it after
+        # every request.
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 60)),
+        # Behind pgbouncer in transaction mode a cursor may move to another
+        # server connection, so named cursors cannot be used.
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_POOLED') == '1',
     }
 }
 
+# Read replicas, one alias per host in DB_REPLICA_HOSTS. Safe requests
+# read from them, see api_yamdb/routers.py.
+REPLICA_DATABASES = []
+for number, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = dict(
+        DATABASES['default'],
+        HOST=host.strip(),
+        TEST={'MIRROR': 'default'},
+    )
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+# Seconds reads of a client stay on the primary after it wrote, which
+# should exceed the usual replication lag.
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Persistent connections idle for longer than this many seconds are
+# checked before a request uses them.
+DB_HEALTH_CHECK_INTERVAL = int(
+    os.environ.get('DB_HEALTH_CHECK_INTERVAL', 30)
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# docker-compose points CACHE_BACKEND at its memcached service. The
+# local-memory default is private to a worker process, so with several
+# gunicorn workers a write would invalidate cached responses only in its
+# own worker; the response cache is then turned off. Throttling counters
+# are per worker on that backend as well.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 60 * 60))
+if (CACHES['default']['BACKEND'].endswith('LocMemCache')
+        and int(os.environ.get('GUNICORN_WORKERS', 1)) > 1):
+    API_CACHE_TIMEOUT = 0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -142,14 +200,19 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'confirmation_code': os.environ.get(
+            'CONFIRMATION_CODE_RATE', '5/hour'
+        ),
+    },
 }
 
 
@@ -157,7 +220,90 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=10),
 }
 
+# Seconds a revoked token may still pass in processes that cached the
+# previous token version of its user.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Title leaderboards: the weighted rating adds RANKING_MIN_REVIEWS votes
+# of RANKING_PRIOR_MEAN to every title, trending counts reviews of the
+# last RANKING_RECENT_DAYS days (see `manage.py refresh_rankings`).
+RANKING_MIN_REVIEWS = 10
+RANKING_PRIOR_MEAN = 6.0
+RANKING_RECENT_DAYS = 7
+
+# Largest array accepted by the bulk endpoints of titles, genres and
+# categories; bigger imports are sent in several requests.
+BULK_MAX_ITEMS = 5000
+
+# Rows read per query by the streaming export endpoints.
+EXPORT_CHUNK_SIZE = 2000
+
+# Per-view request metrics: Server-Timing headers, a JSON log line per
+# request and histograms at /metrics. Off unless METRICS_ENABLED=1.
+# Server-Timing is only sent to requests carrying METRICS_TOKEN in the
+# X-Metrics-Token header; with a token set, /metrics requires it too.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+METRICS_QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# Repeated and slow query detection, see api_yamdb/querycheck.py. Tests
+# always check, QUERYCHECK_ENABLED=1 logs problems of live requests.
+QUERYCHECK_ENABLED = os.environ.get('QUERYCHECK_ENABLED') == '1'
+QUERYCHECK_REPEAT_THRESHOLD = 3
+QUERYCHECK_DEFAULT_BUDGET = 10
+QUERYCHECK_BUDGETS = {}
+QUERYCHECK_EXPLAIN_MS = (
+    float(os.environ['QUERYCHECK_EXPLAIN_MS'])
+    if os.environ.get('QUERYCHECK_EXPLAIN_MS') else None
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api_yamdb.metrics': {
+            'handlers': ['console'],
+            'level': os.environ.get('METRICS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'api_yamdb.querycheck': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# Change feed: entries per page of changes/ and days entries are kept by
+# the prune_changes command.
+CHANGE_FEED_PAGE_SIZE = 500
+CHANGE_FEED_RETENTION_DAYS = 30
+
+# Seconds a confirmation code sent by auth/email/ stays valid.
+CONFIRMATION_CODE_TIMEOUT = 24 * 60 * 60
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = 'sent_emails'
 FROM_EMAIL = 'noreply@yamdb.com'
+
+# Emails are queued in the outbox table and delivered by
+# `manage.py send_outbox --loop` (the mailer service in docker-compose).
+# Claimed emails are retried after OUTBOX_CLAIM_TIMEOUT seconds if their
+# worker dies, delivered and failed ones are deleted by prune_outbox after
+# OUTBOX_RETENTION_DAYS.
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 8))
+OUTBOX_RETRY_DELAY = 30
+OUTBOX_MAX_RETRY_DELAY = 3600
+OUTBOX_POLL_INTERVAL = 5
+OUTBOX_CLAIM_TIMEOUT = 600
+OUTBOX_RETENTION_DAYS = 7
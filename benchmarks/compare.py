@@ -0,0 +1,53 @@
+"""
+Compare two result files of benchmarks.scenarios.
+
+Prints every metric of every scenario side by side with the relative
+change, so runs of two commits can be checked at a glance.
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+
+METRICS = ('rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+
+
+def change(before, after):
+    if before is None or after is None:
+        return ''
+    if not before:
+        return 'n/a'
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def compare(before, after):
+    """Yield rows of scenario, metric, both values and the change."""
+    for name, result in after['scenarios'].items():
+        previous = before['scenarios'].get(name)
+        if previous is None:
+            continue
+        for metric in METRICS:
+            yield (
+                name, metric, previous.get(metric), result.get(metric),
+                change(previous.get(metric), result.get(metric)),
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args()
+    with open(args.before) as before, open(args.after) as after:
+        before, after = json.load(before), json.load(after)
+    print(
+        f"{(before['meta']['commit'] or '?')[:10]} -> "
+        f"{(after['meta']['commit'] or '?')[:10]}"
+    )
+    for row in compare(before, after):
+        print('{:<8} {:<20} {!s:>10} {!s:>10} {:>8}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
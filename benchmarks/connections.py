@@ -0,0 +1,80 @@
+"""
+Compare per-request, persistent and pooled database connections.
+
+Runs the WSGI server once per variant and loads the read endpoints like
+benchmarks.serving. Connection setup is cheap on SQLite, so point BENCH_DB_*
+at PostgreSQL for meaningful numbers; pass --pooler to include a
+pgbouncer in front of it.
+
+    BENCH_DB_ENGINE=django.db.backends.postgresql BENCH_DB_NAME=bench ... \\
+        python -m benchmarks.connections --pooler 127.0.0.1:6432
+"""
+
+import argparse
+import json
+
+from benchmarks.serving import load, read_paths, start_server
+from benchmarks.utils import setup
+
+
+def variants(pooler):
+    result = {
+        'per request': {'CONN_MAX_AGE': '0'},
+        'persistent': {'CONN_MAX_AGE': '600'},
+    }
+    if pooler:
+        host, port = pooler.split(':')
+        result['pooled'] = {
+            'CONN_MAX_AGE': '600',
+            'BENCH_DB_HOST': host,
+            'BENCH_DB_PORT': port,
+            'DB_POOLED': '1',
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pooler', help='host:port of pgbouncer.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--cpus', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    args = parser.parse_args()
+    setup()
+
+    from django.core.management import call_command
+
+    from api.models import Comment
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    if not Comment.objects.exists():
+        seed()
+    paths = read_paths()
+
+    report = {}
+    for label, environ in variants(args.pooler).items():
+        # Anonymous responses are cached, the cache is off to reach the DB.
+        server = start_server(
+            'wsgi', args.port, args.workers, args.cpus,
+            API_CACHE_TIMEOUT='0', **environ,
+        )
+        try:
+            report[label] = load(
+                f'http://127.0.0.1:{args.port}', paths,
+                args.concurrency, args.duration,
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print(f'{label}: {report[label]}')
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
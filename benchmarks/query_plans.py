@@ -0,0 +1,125 @@
+"""
+Compare query plans of the hot lookups with and without lookup indexes.
+
+Seeds the benchmark database when it is empty, then explains and times
+every query shape with the indexes of migration 0004_lookup_indexes
+dropped, and again after recreating them. Migrations are not rolled
+back: later ones depend on more than these indexes.
+
+    python -m benchmarks.query_plans --titles 20000 --reviews 400000
+"""
+
+import argparse
+import json
+from contextlib import contextmanager
+from importlib import import_module
+
+from benchmarks.utils import setup, timed
+
+LOOKUP_INDEXES_MIGRATION = 'api.migrations.0004_lookup_indexes'
+
+
+def query_shapes():
+    from api.models import Comment, Review, Title
+
+    review = Review.objects.order_by('id').first()
+    comment = Comment.objects.order_by('id').first()
+    fragment = Title.objects.order_by('id').first().name[:4]
+    return {
+        'review exists for author': lambda: Review.objects.filter(
+            title_id=review.title_id, author_id=review.author_id
+        )[:1],
+        'reviews of title': lambda: Review.objects.filter(
+            title_id=review.title_id
+        ).order_by('-id')[:10],
+        'comments of review': lambda: Comment.objects.filter(
+            review_id=comment.review_id
+        ).order_by('-id')[:10],
+        'titles by category': lambda: Title.objects.filter(
+            category__slug__iexact='movie'
+        )[:10],
+        'titles by genre': lambda: Title.objects.filter(
+            genre__slug__iexact='drama'
+        )[:10],
+        'titles by name': lambda: Title.objects.filter(
+            name__contains=fragment
+        )[:10],
+    }
+
+
+@contextmanager
+def without_lookup_indexes():
+    """Drop the indexes and constraint of the lookup migration meanwhile."""
+    from django.db import connection, migrations
+    from django.db.migrations.loader import MigrationLoader
+
+    lookup_indexes = import_module(LOOKUP_INDEXES_MIGRATION)
+    removal = migrations.Migration('remove_lookup_indexes', 'api')
+    for operation in lookup_indexes.Migration.operations:
+        if isinstance(operation, migrations.AddIndex):
+            removal.operations.append(migrations.RemoveIndex(
+                operation.model_name, operation.index.name
+            ))
+        elif isinstance(operation, migrations.AddConstraint):
+            removal.operations.append(migrations.RemoveConstraint(
+                operation.model_name, operation.constraint.name
+            ))
+    removal.operations.append(migrations.RunPython(
+        lookup_indexes.drop_postgres_indexes,
+        lookup_indexes.create_postgres_indexes,
+    ))
+    state = MigrationLoader(connection).project_state()
+    with connection.schema_editor() as editor:
+        removal.apply(state.clone(), editor)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            removal.unapply(state, editor)
+
+
+def measure(repeat):
+    results = {}
+    for label, build in query_shapes().items():
+        results[label] = {
+            'plan': build().explain(),
+            'ms': round(timed(lambda: list(build()), repeat), 3),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=400000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    args = parser.parse_args()
+    setup()
+
+    from django.core.management import call_command
+
+    from api.models import Title
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    if not Title.objects.exists():
+        seed(titles=args.titles, reviews=args.reviews,
+             comments=args.reviews // 4, users=max(500, args.reviews // 100))
+
+    with without_lookup_indexes():
+        report = {'without indexes': measure(args.repeat)}
+    report['with indexes'] = measure(args.repeat)
+
+    for stage, results in report.items():
+        print(f'== {stage}')
+        for label, result in results.items():
+            print(f'{label}: {result["ms"]} ms')
+            print(f'    {result["plan"]}')
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
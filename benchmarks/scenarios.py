@@ -0,0 +1,393 @@
+"""
+Run realistic request mixes against the API and store results as JSON.
+
+Each scenario is a weighted mix of requests sent by simulated clients:
+anonymous browsing of titles, filtered search, reading and posting
+reviews, and comment threads. The in-process transport calls the WSGI
+handler through Django's test client and counts SQL with the query
+recorder. The http transport loads gunicorn started as in
+benchmarks.serving and reads query counts from the Server-Timing header
+of the metrics middleware, sent for the METRICS_TOKEN of the server.
+Results carry the commit, so runs can be compared with benchmarks.compare.
+Like every benchmark it runs on the database of benchmarks.settings only;
+its users have addresses at BENCH_EMAIL_DOMAIN and their reviews are
+deleted before each run.
+
+    python -m benchmarks.seed --titles 100000 --reviews 10000000 --flush
+    python -m benchmarks.scenarios --transport http --output run.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import secrets
+import subprocess
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+
+from benchmarks.utils import percentile, setup
+
+SCENARIOS = {
+    'browse': {'title_list': 60, 'title_detail': 25, 'review_list': 15},
+    'search': {'by_genre': 40, 'by_year': 30, 'by_name': 30},
+    'review': {'review_list': 70, 'post_review': 30},
+    'thread': {'comment_list': 60, 'review_detail': 20, 'post_comment': 20},
+}
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# Reserved by RFC 2606, so no real account can carry it.
+BENCH_EMAIL_DOMAIN = 'bench.invalid'
+
+
+class Workload:
+    """Ids and values requests are built from, sampled from the dataset."""
+
+    def __init__(self, clients, sample_size=1000, random_seed=0):
+        from django.db.models import Max
+
+        from api.models import Category, Genre, Review, Title
+
+        # Earlier benchmark reviews are deleted first, none may be sampled.
+        self.tokens = bench_tokens(clients)
+        rng = random.Random(random_seed)
+        last_review = Review.objects.aggregate(last=Max('id'))['last'] or 0
+        review_ids = [
+            rng.randint(1, last_review) for _ in range(sample_size)
+        ] if last_review else []
+        self.reviews = list(
+            Review.objects.filter(id__in=review_ids)
+            .values_list('title_id', 'id')
+        )
+        self.titles = sorted({title_id for title_id, _ in self.reviews})
+        if not self.titles:
+            raise RuntimeError('Seed the database with benchmarks.seed.')
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.years = list(
+            Title.objects.filter(id__in=self.titles)
+            .values_list('year', flat=True)
+        )
+        self.words = [
+            word for name in Title.objects.filter(id__in=self.titles)
+            .values_list('name', flat=True)[:100]
+            for word in name.split() if len(word) > 3
+        ]
+        self.post_titles = iter(
+            list(Title.objects.values_list('id', flat=True))
+        )
+        self.lock = threading.Lock()
+
+    def next_post_title(self):
+        with self.lock:
+            title_id = next(self.post_titles, None)
+        if title_id is None:
+            raise RuntimeError('Every title got a review, seed more titles.')
+        return title_id
+
+
+def bench_tokens(count):
+    """Access tokens of users posting reviews, without earlier reviews."""
+    from api.models import Review, User
+    from api.serializers import CustomTokenObtainPairSerializer
+
+    Review.objects.filter(
+        author__email__endswith=f'@{BENCH_EMAIL_DOMAIN}'
+    ).delete()
+    tokens = []
+    for number in range(count):
+        user, _ = User.objects.get_or_create(
+            email=f'bench{number}@{BENCH_EMAIL_DOMAIN}',
+            defaults={'username': f'bench{number}'},
+        )
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        tokens.append(str(refresh.access_token))
+    return tokens
+
+
+def title_list(workload, rng):
+    return 'GET', f'/api/v1/titles/?page={rng.randint(1, 20)}', None, False
+
+
+def title_detail(workload, rng):
+    title_id, _ = rng.choice(workload.reviews)
+    return 'GET', f'/api/v1/titles/{title_id}/', None, False
+
+
+def review_list(workload, rng):
+    title_id, _ = rng.choice(workload.reviews)
+    return 'GET', f'/api/v1/titles/{title_id}/reviews/', None, False
+
+
+def review_detail(workload, rng):
+    return 'GET', review_path(*rng.choice(workload.reviews)), None, False
+
+
+def comment_list(workload, rng):
+    path = review_path(*rng.choice(workload.reviews))
+    return 'GET', f'{path}comments/', None, False
+
+
+def by_genre(workload, rng):
+    genre = rng.choice(workload.genres)
+    category = rng.choice(workload.categories)
+    path = f'/api/v1/titles/?genre={genre}&category={category}'
+    return 'GET', path, None, False
+
+
+def by_year(workload, rng):
+    year = rng.choice(workload.years)
+    return 'GET', f'/api/v1/titles/?year={year}', None, False
+
+
+def by_name(workload, rng):
+    word = urllib.request.quote(rng.choice(workload.words))
+    return 'GET', f'/api/v1/titles/?name={word}', None, False
+
+
+def post_review(workload, rng):
+    # Titles are handed out once per run, so no review is rejected as a
+    # second review of the same author.
+    path = f'/api/v1/titles/{workload.next_post_title()}/reviews/'
+    body = {'text': 'Benchmark review', 'score': rng.randint(1, 10)}
+    return 'POST', path, body, True
+
+
+def post_comment(workload, rng):
+    path = review_path(*rng.choice(workload.reviews))
+    return 'POST', f'{path}comments/', {'text': 'Benchmark comment'}, True
+
+
+def review_path(title_id, review_id):
+    return f'/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+
+REQUESTS = {
+    request.__name__: request
+    for request in (
+        title_list, title_detail, review_list, review_detail, comment_list,
+        by_genre, by_year, by_name, post_review, post_comment,
+    )
+}
+
+
+class InProcessTransport:
+    """Django test client: the WSGI handler without a network."""
+
+    def __init__(self, token):
+        from django.test import Client
+
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.anonymous = Client()
+
+    def request(self, method, path, body, authenticate):
+        from api_yamdb.querycheck import record_queries
+
+        client = self.client if authenticate else self.anonymous
+        with record_queries() as recorder:
+            if method == 'GET':
+                response = client.get(path)
+            else:
+                response = client.post(
+                    path, body, content_type='application/json'
+                )
+        return response.status_code, len(recorder.queries)
+
+
+class HttpTransport:
+    """Plain HTTP against a running server."""
+
+    def __init__(self, base_url, token, metrics_token):
+        self.base_url = base_url
+        self.token = token
+        self.metrics_token = metrics_token
+
+    def request(self, method, path, body, authenticate):
+        request = urllib.request.Request(
+            self.base_url + path,
+            method=method,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={
+                'Content-Type': 'application/json',
+                'X-Metrics-Token': self.metrics_token,
+            },
+        )
+        if authenticate:
+            request.add_header('Authorization', f'Bearer {self.token}')
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, timing = response.status, response.headers
+        except HTTPError as error:
+            status, timing = error.code, error.headers
+        match = SERVER_TIMING_QUERIES.search(timing.get('Server-Timing', ''))
+        return status, int(match.group(1)) if match else None
+
+
+def run_scenario(mix, workload, transports, duration, random_seed=0):
+    """Send requests of the mix from one thread per transport."""
+    kinds, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+
+    def client(number):
+        rng = random.Random(random_seed * 1000 + number)
+        samples = []
+        while time.monotonic() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            request = REQUESTS[kind](workload, rng)
+            started = time.perf_counter()
+            try:
+                status, queries = transports[number].request(*request)
+            except (URLError, ConnectionError):
+                status, queries = None, None
+            samples.append(
+                ((time.perf_counter() - started) * 1000, status, queries)
+            )
+        return samples
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(len(transports)) as executor:
+        results = list(executor.map(client, range(len(transports))))
+    return summarize(
+        [sample for samples in results for sample in samples],
+        time.monotonic() - started,
+    )
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(ms for ms, _, _ in samples)
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        'requests': len(samples),
+        'errors': sum(
+            1 for _, status, _ in samples if status is None or status >= 400
+        ),
+        'rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) or 0, 2),
+        'p95_ms': round(percentile(latencies, 0.95) or 0, 2),
+        'p99_ms': round(percentile(latencies, 0.99) or 0, 2),
+        'queries_per_request': (
+            round(sum(queries) / len(queries), 2) if queries else None
+        ),
+    }
+
+
+def run_metadata(args):
+    from django import get_version
+    from django.db import connection
+
+    from api.models import Comment, Review, Title
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'django': get_version(),
+        'database': connection.vendor,
+        'transport': args.transport,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'cache': not args.no_cache,
+        'dataset': {
+            'titles': Title.objects.count(),
+            'reviews': Review.objects.count(),
+            'comments': Comment.objects.count(),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS),
+                        choices=list(SCENARIOS))
+    parser.add_argument('--transport', default='in-process',
+                        choices=['in-process', 'http'])
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Simulated clients, keep 1 in-process on '
+                             'SQLite to avoid lock waits.')
+    parser.add_argument('--duration', type=float, default=10,
+                        help='Seconds per scenario.')
+    parser.add_argument('--url', help='Load this server instead of '
+                                      'starting gunicorn.')
+    parser.add_argument('--metrics-token', default=secrets.token_hex(16),
+                        help='METRICS_TOKEN of the server given by --url.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--cpus', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Turn off the API response cache.')
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    args = parser.parse_args()
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+
+    from api.models import Comment
+    from benchmarks.seed import seed
+    from benchmarks.serving import start_server
+
+    call_command('migrate', verbosity=0)
+    if not Comment.objects.exists():
+        seed()
+    if args.no_cache:
+        settings.API_CACHE_TIMEOUT = 0
+    workload = Workload(args.concurrency, random_seed=args.random_seed)
+
+    server = None
+    if args.transport == 'http':
+        base_url = args.url
+        if base_url is None:
+            environ = {
+                'METRICS_ENABLED': '1',
+                'METRICS_LOG_LEVEL': 'WARNING',
+                'METRICS_TOKEN': args.metrics_token,
+            }
+            if args.no_cache:
+                environ['API_CACHE_TIMEOUT'] = '0'
+            server = start_server(
+                'wsgi', args.port, args.workers, args.cpus, **environ
+            )
+            base_url = f'http://127.0.0.1:{args.port}'
+        transports = [
+            HttpTransport(base_url, token, args.metrics_token)
+            for token in workload.tokens
+        ]
+    else:
+        transports = [InProcessTransport(token) for token in workload.tokens]
+
+    report = {'meta': run_metadata(args), 'scenarios': {}}
+    try:
+        for name in args.scenarios:
+            result = run_scenario(
+                SCENARIOS[name], workload, transports, args.duration,
+                args.random_seed,
+            )
+            report['scenarios'][name] = result
+            print(f'{name}: {result}')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
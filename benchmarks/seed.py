@@ -0,0 +1,178 @@
+"""
+Fill the benchmark database with a generated dataset.
+
+Names, years and texts are sampled from the fixtures in data/, so rows have
+the same shape as the real catalog. Rows are generated and inserted in
+chunks, which keeps memory flat for tens of millions of reviews.
+
+    python -m benchmarks.seed --titles 100000 --reviews 10000000 --flush
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+from datetime import timedelta
+from itertools import islice
+
+from benchmarks.utils import setup
+
+
+def read_column(filename, column):
+    from django.conf import settings
+    path = os.path.join(settings.BASE_DIR, 'data', filename)
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        return [row[column] for row in csv.DictReader(csv_file)]
+
+
+def insert(model, objects, batch_size, dated=()):
+    """Insert generated objects chunk by chunk, returning their count."""
+    from api.management.commands.import_csv import imported_dates
+    objects = iter(objects)
+    total = 0
+    chunk = list(islice(objects, batch_size))
+    while chunk:
+        with imported_dates(model, dated):
+            model.objects.bulk_create(chunk)
+        total += len(chunk)
+        chunk = list(islice(objects, batch_size))
+    return total
+
+
+def seed(titles=1000, reviews=20000, comments=5000, users=500,
+         batch_size=5000, random_seed=0, stdout=print):
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.core.management.color import no_style
+    from django.db import connection
+    from django.utils import timezone
+
+    from api.cache import bump_versions
+    from api.models import Category, Comment, Genre, Review, Title, User
+
+    if reviews > titles * users:
+        raise ValueError('Every user can review a title only once.')
+    if Title.objects.exists() or User.objects.exists():
+        raise RuntimeError('Benchmark database is not empty, use --flush.')
+
+    rng = random.Random(random_seed)
+    names = read_column('titles.csv', 'name')
+    years = [int(year) for year in read_column('titles.csv', 'year')]
+    review_texts = read_column('review.csv', 'text')
+    comment_texts = read_column('comments.csv', 'text')
+    now = timezone.now()
+    password = make_password(None)
+
+    def published():
+        return now - timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600))
+
+    categories = insert(Category, (
+        Category(id=int(row_id), name=name, slug=slug)
+        for row_id, name, slug in zip(
+            read_column('category.csv', 'id'),
+            read_column('category.csv', 'name'),
+            read_column('category.csv', 'slug'),
+        )
+    ), batch_size)
+    genres = insert(Genre, (
+        Genre(id=int(row_id), name=name, slug=slug)
+        for row_id, name, slug in zip(
+            read_column('genre.csv', 'id'),
+            read_column('genre.csv', 'name'),
+            read_column('genre.csv', 'slug'),
+        )
+    ), batch_size)
+    insert(User, (
+        User(
+            id=number,
+            username=f'user{number}',
+            email=f'user{number}@yamdb.fake',
+            password=password,
+        )
+        for number in range(1, users + 1)
+    ), batch_size)
+    insert(Title, (
+        Title(
+            id=number,
+            name=f'{rng.choice(names)} {number}',
+            year=rng.choice(years),
+            description=rng.choice(review_texts)[:200],
+            category_id=rng.randint(1, categories),
+        )
+        for number in range(1, titles + 1)
+    ), batch_size)
+    insert(Title.genre.through, (
+        Title.genre.through(title_id=number, genre_id=genre_id)
+        for number in range(1, titles + 1)
+        for genre_id in rng.sample(range(1, genres + 1), rng.randint(1, 3))
+    ), batch_size)
+    insert(Review, (
+        Review(
+            id=number,
+            title_id=(number - 1) % titles + 1,
+            author_id=(number - 1) // titles % users + 1,
+            text=rng.choice(review_texts),
+            score=rng.randint(1, 10),
+            pub_date=published(),
+        )
+        for number in range(1, reviews + 1)
+    ), batch_size, dated=('pub_date',))
+    if reviews:
+        insert(Comment, (
+            Comment(
+                id=number,
+                review_id=rng.randint(1, reviews),
+                author_id=rng.randint(1, users),
+                text=rng.choice(comment_texts),
+                pub_date=published(),
+            )
+            for number in range(1, comments + 1)
+        ), batch_size, dated=('pub_date',))
+
+    models = [User, Category, Genre, Title, Title.genre.through, Review,
+              Comment]
+    with connection.cursor() as cursor:
+        for statement in connection.ops.sequence_reset_sql(
+                no_style(), models):
+            cursor.execute(statement)
+    call_command('refresh_ratings', stdout=io.StringIO())
+    call_command('rebuild_title_stats', stdout=io.StringIO())
+    call_command('refresh_rankings', stdout=io.StringIO())
+    bump_versions(*models)
+    stdout(
+        f'Seeded {users} users, {titles} titles, {reviews} reviews '
+        f'and {comments} comments.'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=20000)
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument(
+        '--flush', action='store_true', help='Empty the database first.'
+    )
+    args = parser.parse_args()
+    setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    if args.flush:
+        call_command('flush', interactive=False, verbosity=0)
+    seed(
+        titles=args.titles,
+        reviews=args.reviews,
+        comments=args.comments,
+        users=args.users,
+        batch_size=args.batch_size,
+        random_seed=args.random_seed,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Compare WSGI and ASGI serving of the read endpoints under load.
+
+Starts gunicorn once per mode with the same number of workers pinned to the
+same CPUs, then requests title, review and comment lists from concurrent
+clients for a fixed time. Django 3.0 has no async views, so in ASGI mode
+the views run in the thread pool of each uvicorn worker. The response
+cache is off, otherwise the same three anonymous lists would come from
+the cache and the views would hardly run.
+
+    python -m benchmarks.serving --workers 2 --cpus 2 --concurrency 32
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+
+from benchmarks.utils import percentile, setup
+
+MODES = {
+    'wsgi': ('api_yamdb.wsgi:application', 'sync'),
+    'asgi': ('api_yamdb.asgi:application', 'uvicorn.workers.UvicornWorker'),
+}
+
+
+def read_paths():
+    from api.models import Comment
+
+    comment = Comment.objects.order_by('id').first()
+    review = comment.review
+    return [
+        '/api/v1/titles/',
+        f'/api/v1/titles/{review.title_id}/reviews/',
+        f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/',
+    ]
+
+
+def start_server(mode, port, workers, cpus, **environ):
+    """Start gunicorn with gunicorn.conf.py and wait until it answers."""
+    app_module, worker_class = MODES[mode]
+    env = dict(
+        os.environ, DJANGO_SETTINGS_MODULE='benchmarks.settings', **environ
+    )
+    server_cpus = sorted(os.sched_getaffinity(0))[:cpus]
+    process = subprocess.Popen(
+        [
+            'gunicorn', app_module,
+            '--worker-class', worker_class,
+            '--workers', str(workers),
+            '--bind', f'127.0.0.1:{port}',
+            '--log-level', 'warning',
+        ],
+        env=env,
+        preexec_fn=lambda: os.sched_setaffinity(0, server_cpus),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/'):
+                return process
+        except HTTPError:
+            return process
+        except (URLError, ConnectionError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start.')
+
+
+def load(base_url, paths, concurrency, duration):
+    """Request paths in turn from concurrent clients until time is up."""
+    deadline = time.monotonic() + duration
+
+    def client(number):
+        latencies, errors = [], 0
+        position = number
+        while time.monotonic() < deadline:
+            url = base_url + paths[position % len(paths)]
+            position += 1
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+            except (URLError, ConnectionError):
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies, errors
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(client, range(concurrency)))
+    elapsed = time.monotonic() - started
+    latencies = sorted(ms for client_ms, _ in results for ms in client_ms)
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) or 0, 2),
+        'p95_ms': round(percentile(latencies, 0.95) or 0, 2),
+        'p99_ms': round(percentile(latencies, 0.99) or 0, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--modes', nargs='+', default=list(MODES),
+                        choices=list(MODES))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--cpus', type=int, default=2,
+                        help='Number of CPUs the server is pinned to.')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    args = parser.parse_args()
+    setup()
+
+    from django.core.management import call_command
+
+    from api.models import Comment
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    if not Comment.objects.exists():
+        seed()
+    paths = read_paths()
+
+    report = {}
+    for mode in args.modes:
+        server = start_server(
+            mode, args.port, args.workers, args.cpus, API_CACHE_TIMEOUT='0'
+        )
+        try:
+            report[mode] = load(
+                f'http://127.0.0.1:{args.port}', paths,
+                args.concurrency, args.duration,
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print(f'{mode}: {report[mode]}')
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Settings for running benchmarks.
+
+Benchmarks seed, flush and alter their database, so they never read the
+DB_* variables of the application: an .env of a deployment must not lead
+them to real data. The database is a scratch SQLite file unless the
+BENCH_DB_* variables name a dedicated one, e.g. on PostgreSQL:
+
+    BENCH_DB_ENGINE=django.db.backends.postgresql BENCH_DB_NAME=bench \\
+        BENCH_DB_USER=... BENCH_DB_PASSWORD=... BENCH_DB_HOST=...
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from api_yamdb.settings import *  # noqa: F401,F403
+from api_yamdb.settings import BASE_DIR
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.environ.get(
+            'BENCH_DB_ENGINE', 'django.db.backends.sqlite3'
+        ),
+        'NAME': os.environ.get(
+            'BENCH_DB_NAME', os.path.join(BASE_DIR, 'bench.sqlite3')
+        ),
+        'USER': os.environ.get('BENCH_DB_USER'),
+        'PASSWORD': os.environ.get('BENCH_DB_PASSWORD'),
+        'HOST': os.environ.get('BENCH_DB_HOST'),
+        'PORT': os.environ.get('BENCH_DB_PORT'),
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 60)),
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_POOLED') == '1',
+    }
+}
+REPLICA_DATABASES = []
+
+if 'BENCH_DB_ENGINE' in os.environ and 'BENCH_DB_NAME' not in os.environ:
+    raise ImproperlyConfigured('BENCH_DB_ENGINE requires BENCH_DB_NAME.')
+if DATABASES['default']['NAME'] == os.environ.get('DB_NAME'):
+    raise ImproperlyConfigured(
+        'BENCH_DB_NAME is the application database, benchmarks need '
+        'a dedicated one.'
+    )
+
+ALLOWED_HOSTS = ['*']
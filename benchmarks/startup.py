@@ -0,0 +1,85 @@
+"""
+Record memory of gunicorn workers with and without preload_app.
+
+Starts gunicorn with gunicorn.conf.py, waits until every worker is up and
+answers a request, then reads RSS and PSS of the master and each worker.
+PSS counts pages shared copy-on-write only partially, so its total shows
+what preloading saves.
+
+    python -m benchmarks.startup --workers 4 --output startup.json
+"""
+
+import argparse
+import json
+import time
+import urllib.request
+
+from benchmarks.serving import MODES, start_server
+from benchmarks.utils import setup
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as children:
+        return [int(pid) for pid in children.read().split()]
+
+
+def measure(mode, port, workers, cpus, preload):
+    from api_yamdb.memory import process_memory
+
+    started = time.monotonic()
+    server = start_server(
+        mode, port, workers, cpus, GUNICORN_PRELOAD='1' if preload else '0'
+    )
+    try:
+        while len(worker_pids(server.pid)) < workers:
+            time.sleep(0.1)
+        for _ in range(workers * 2):
+            with urllib.request.urlopen(
+                    f'http://127.0.0.1:{port}/api/v1/titles/') as response:
+                response.read()
+        ready = time.monotonic() - started
+        pids = worker_pids(server.pid)
+        usage = [process_memory(pid) for pid in pids]
+        return {
+            'ready_s': round(ready, 2),
+            'master': process_memory(server.pid),
+            'workers': usage,
+            'workers_rss_kb': sum(item['rss_kb'] or 0 for item in usage),
+            'workers_pss_kb': sum(item['pss_kb'] or 0 for item in usage),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--mode', default='wsgi', choices=list(MODES))
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--cpus', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    args = parser.parse_args()
+    setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    report = {}
+    for preload in (False, True):
+        label = 'preload' if preload else 'no preload'
+        report[label] = measure(
+            args.mode, args.port, args.workers, args.cpus, preload
+        )
+        print(
+            f'{label}: ready in {report[label]["ready_s"]}s, workers '
+            f'rss={report[label]["workers_rss_kb"]} kB '
+            f'pss={report[label]["workers_pss_kb"]} kB'
+        )
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
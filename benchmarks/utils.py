@@ -0,0 +1,26 @@
+import os
+import time
+
+import django
+
+
+def setup():
+    """Configure Django with the benchmark settings."""
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    django.setup()
+
+
+def timed(function, repeat):
+    """Return average milliseconds of ``repeat`` calls of ``function``."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def percentile(values, fraction):
+    """Return the ``fraction`` percentile of already sorted values."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
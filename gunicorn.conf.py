@@ -0,0 +1,75 @@
+"""
+Gunicorn settings, read from the working directory on start.
+
+Every value can be tuned through the environment of the web service.
+"""
+
+import logging
+import math
+import os
+
+from api_yamdb.memory import process_memory
+
+
+def available_cpus():
+    """CPUs of the affinity mask, limited by the cgroup v2 CPU quota."""
+    cpus = len(os.sched_getaffinity(0))
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()
+        quota = int(quota)
+    except (OSError, ValueError):
+        # No cgroup v2 or no quota ("max").
+        return cpus
+    return max(1, min(cpus, math.ceil(quota / int(period))))
+
+
+cpu_count = available_cpus()
+# Every worker thread keeps its own database connection for CONN_MAX_AGE,
+# the default sizes stay within this many connections per server.
+max_connections = int(os.environ.get('GUNICORN_MAX_CONNECTIONS', 40))
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = os.environ.get('WORKER_CLASS', 'sync')
+workers = int(os.environ.get(
+    'WEB_CONCURRENCY', min(cpu_count * 2 + 1, max_connections)
+))
+# More than one thread turns sync workers into gthread workers. Async
+# workers run views in a thread pool of their own.
+default_threads = 1
+if worker_class == 'sync':
+    default_threads = max(1, min(cpu_count, max_connections // workers))
+threads = int(os.environ.get('GUNICORN_THREADS', default_threads))
+# Read by the settings to tell whether a per-process cache is shared.
+os.environ['GUNICORN_WORKERS'] = str(workers)
+
+# Import the application once in the master, forked workers share the
+# loaded code copy-on-write.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Restart workers after a number of requests to bound memory growth, the
+# jitter keeps them from restarting all at once.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Heartbeat files on tmpfs, a disk-backed /tmp can stall workers in Docker.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared by workers.
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    usage = process_memory()
+    logging.getLogger('gunicorn.error').info(
+        'Worker %s started: rss=%s kB pss=%s kB',
+        worker.pid, usage['rss_kb'], usage['pss_kb'],
+    )
@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        email='reviewer@yamdb.fake', username='reviewer'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        email='critic@yamdb.fake', username='critic'
+    )
+
+
+@pytest.fixture
+def title():
+    from api.models import Title
+    return Title.objects.create(name='Побег из Шоушенка', year=1994)
+
+
+@pytest.fixture
+def catalog(user, another_user):
+    """Several titles with genres, reviews and comments."""
+    from api.models import Category, Comment, Genre, Review, Title
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    titles = []
+    for number in range(5):
+        title = Title.objects.create(
+            name=f'Фильм {number}', year=2000 + number, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=score
+        )
+        for author, score in ((user, 8), (another_user, 5))
+    ]
+    for author in (user, another_user, user):
+        Comment.objects.create(review=reviews[0], author=author, text='Да')
+    return titles
+
+
+@pytest.fixture
+def user_client(user):
+    from rest_framework.test import APIClient
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def staff_client(django_user_model):
+    from rest_framework.test import APIClient
+    admin = django_user_model.objects.create_user(
+        email='admin@yamdb.fake', username='admin', role='admin'
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+
+import pytest
+
+
+@pytest.fixture
+def query_check():
+    """
+    Fail the test if the block repeats query shapes or blows the budget.
+
+        with query_check('title-list'):
+            client.get('/api/v1/titles/')
+    """
+    from api_yamdb.querycheck import find_problems, record_queries
+
+    @contextmanager
+    def check(view_name=None, budget=None):
+        with record_queries() as recorder:
+            yield recorder
+        problems = find_problems(recorder.queries, view_name, budget)
+        if problems:
+            pytest.fail(
+                f'Query problems in {view_name or "block"}:\n'
+                + '\n'.join(problems),
+                pytrace=False,
+            )
+
+    return check
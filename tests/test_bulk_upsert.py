@@ -0,0 +1,139 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Category, Genre, Title
+
+
+def selects_from(queries, table):
+    return [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkUpsert:
+
+    def test_genres_are_created_and_renamed(self, staff_client):
+        Genre.objects.create(name='Драма', slug='drama')
+
+        response = staff_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'Драмы', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ], format='json')
+
+        assert response.status_code == 200
+        assert dict(Genre.objects.values_list('slug', 'name')) == {
+            'drama': 'Драмы', 'comedy': 'Комедия',
+        }
+
+    def test_titles_are_created_with_relations(self, staff_client):
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        items = [
+            {
+                'name': f'Фильм {number}',
+                'year': 2000,
+                'category': 'movie',
+                'genre': ['drama', 'comedy'],
+            }
+            for number in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = staff_client.post(
+                '/api/v1/titles/bulk/', data=items, format='json'
+            )
+
+        assert response.status_code == 200
+        assert len(selects_from(queries, 'api_genre')) == 1, (
+            'Проверьте, что слаги жанров разрешаются одним запросом'
+        )
+        assert len(selects_from(queries, 'api_category')) == 1
+        ids = [item['id'] for item in response.json()]
+        assert Title.objects.filter(
+            id__in=ids, category__slug='movie'
+        ).count() == 20
+        assert Title.genre.through.objects.filter(
+            title_id__in=ids
+        ).count() == 40
+
+    def test_titles_are_updated_by_id(self, staff_client, catalog):
+        title = catalog[0]
+        title.refresh_from_db()
+        rating = title.rating
+
+        response = staff_client.post('/api/v1/titles/bulk/', data=[
+            {'id': title.id, 'name': 'Новое имя', 'genre': ['drama']},
+        ], format='json')
+
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert (title.name, title.rating, title.year) == (
+            'Новое имя', rating, 2000
+        )
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
+
+    def test_errors_are_reported_per_item(self, staff_client):
+        Genre.objects.create(name='Драма', slug='drama')
+
+        response = staff_client.post('/api/v1/titles/bulk/', data=[
+            {'name': 'Первый', 'genre': ['drama']},
+            {'name': 'Второй', 'genre': ['western']},
+            {'name': 'Третий', 'year': 3000},
+        ], format='json')
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert errors[1] == {
+            'genre': ['Object with slug=western does not exist.']
+        }
+        assert list(errors[2]) == ['year']
+        assert not Title.objects.exists(), (
+            'Проверьте, что пачка с ошибками не сохраняется'
+        )
+
+    def test_batch_size_is_limited(self, staff_client, settings):
+        settings.BULK_MAX_ITEMS = 1
+
+        response = staff_client.post('/api/v1/categories/bulk/', data=[
+            {'name': 'Фильм', 'slug': 'movie'},
+            {'name': 'Книга', 'slug': 'book'},
+        ], format='json')
+
+        assert response.status_code == 400
+        assert not Category.objects.exists()
+
+    def test_only_admin_can_bulk_upsert(self, user_client):
+        response = user_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'Драма', 'slug': 'drama'},
+        ], format='json')
+
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_delete_is_rejected(staff_client, monkeypatch):
+    from api import bulk
+    Genre.objects.create(name='Драма', slug='drama')
+    resolve = bulk.resolve_title_relations
+
+    def resolve_and_delete(items, errors):
+        relations = resolve(items, errors)
+        # Another request deletes the genre right after it was read.
+        Genre.objects.filter(slug='drama').delete()
+        return relations
+
+    monkeypatch.setattr(bulk, 'resolve_title_relations', resolve_and_delete)
+    response = staff_client.post('/api/v1/titles/bulk/', data=[
+        {'name': 'Первый', 'genre': ['drama']},
+    ], format='json')
+
+    assert response.status_code == 400, (
+        'Проверьте, что конфликт с параллельной записью даёт ошибку 400'
+    )
+    assert not Title.objects.exists()
@@ -0,0 +1,165 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.changes import number_changes
+from api.models import Change, Comment, Genre, Review, Title
+
+
+def entries(after=0):
+    return list(
+        Change.objects.filter(seq__gt=after).order_by('seq')
+        .values_list('model', 'object_id', 'action')
+    )
+
+
+def last_seq():
+    return Change.objects.order_by('seq').values_list('seq', flat=True).last()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChangeFeed:
+
+    def test_writes_are_recorded(self, title, user):
+        start = last_seq()
+        review = Review.objects.create(
+            title=title, author=user, text='Отлично', score=9
+        )
+        comment = Comment.objects.create(review=review, author=user, text='Да')
+        comment_id = comment.id
+        comment.delete()
+
+        assert entries(start) == [
+            ('review', str(review.id), 'created'),
+            ('title', str(title.id), 'updated'),
+            ('comment', str(comment_id), 'created'),
+            ('comment', str(comment_id), 'deleted'),
+        ], 'Проверьте, что создание и удаление попадают в ленту изменений'
+
+    def test_genres_are_keyed_by_slug(self, title):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        start = last_seq()
+        title.genre.add(genre)
+        genre.delete()
+
+        assert entries(start) == [
+            ('title', str(title.id), 'updated'),
+            ('title', str(title.id), 'updated'),
+            ('genre', 'drama', 'deleted'),
+        ], 'Проверьте, что изменения жанров отмечают произведения'
+
+    def test_cascade_leaves_tombstones(self, catalog):
+        title_id = catalog[0].id
+        start = last_seq()
+        catalog[0].delete()
+
+        tombstones = [
+            (model, key) for model, key, action in entries(start)
+            if action == 'deleted'
+        ]
+        assert [model for model, _ in tombstones] == [
+            'comment', 'comment', 'comment', 'review', 'review', 'title'
+        ], 'Проверьте, что каскадное удаление оставляет надгробия'
+        assert tombstones[-1] == ('title', str(title_id))
+
+    def test_bulk_upsert_is_recorded(self, staff_client):
+        response = staff_client.post('/api/v1/titles/bulk/', data=[
+            {'name': 'Новый фильм', 'year': 2000},
+        ], format='json')
+        title_id = response.json()[0]['id']
+
+        assert ('title', str(title_id), 'created') in entries()
+
+    def test_feed_is_paged_by_seq(self, staff_client, settings, title):
+        settings.CHANGE_FEED_PAGE_SIZE = 2
+        for number in range(3):
+            Title.objects.create(name=f'Фильм {number}')
+        seqs = list(Change.objects.values_list('seq', flat=True))
+
+        data = staff_client.get('/api/v1/changes/').json()
+        assert [entry['seq'] for entry in data['results']] == seqs[:2]
+        assert data['last_seq'] == seqs[1]
+        assert data['next'].endswith(f'after={seqs[1]}')
+
+        data = staff_client.get(data['next']).json()
+        assert [entry['seq'] for entry in data['results']] == seqs[2:]
+        assert data['next'] is None
+
+        data = staff_client.get(
+            '/api/v1/changes/', {'after': data['last_seq']}
+        ).json()
+        assert (data['results'], data['last_seq']) == ([], seqs[-1]), (
+            'Проверьте, что опрос с last_seq не возвращает старых событий'
+        )
+
+    def test_entries_are_numbered_after_commit(self, staff_client, title):
+        start = last_seq()
+        with transaction.atomic():
+            Title.objects.create(name='Новый фильм')
+            assert last_seq() == start
+            data = staff_client.get('/api/v1/changes/', {'after': start})
+            assert data.json()['results'] == [], (
+                'Проверьте, что записи незавершённой транзакции не отдаются'
+            )
+
+        assert entries(start) == [
+            ('title', str(Title.objects.get(name='Новый фильм').id),
+             'created')
+        ], 'Проверьте, что записи нумеруются после фиксации транзакции'
+
+    def test_numbering_is_registered_once(self, title, user):
+        def registered():
+            return sum(
+                callback[1] is number_changes
+                for callback in connection.run_on_commit
+            )
+
+        start = last_seq()
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Genre.objects.create(name='Нуар', slug='noir')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            assert registered() == 0
+            Review.objects.create(
+                title=title, author=user, text='Отлично', score=9
+            )
+            Comment.objects.create(
+                review=Review.objects.get(title=title), author=user, text='Да'
+            )
+            assert registered() == 1, (
+                'Проверьте, что нумерация регистрируется один раз '
+                'на транзакцию'
+            )
+
+        assert len(entries(start)) == 3, (
+            'Проверьте, что записи нумеруются после фиксации транзакции'
+        )
+
+    def test_model_filter_and_bad_cursor(self, staff_client, catalog):
+        data = staff_client.get(
+            '/api/v1/changes/', {'model': 'comment'}
+        ).json()
+        assert {entry['model'] for entry in data['results']} == {'comment'}
+
+        response = staff_client.get('/api/v1/changes/', {'after': 'x'})
+        assert response.status_code == 400
+
+    def test_only_admin_reads_feed(self, client, user_client):
+        assert client.get('/api/v1/changes/').status_code == 401
+        assert user_client.get('/api/v1/changes/').status_code == 403
+
+    def test_prune(self, title):
+        Change.objects.update(created_at=timezone.now() - timedelta(days=40))
+        Title.objects.create(name='Свежий')
+
+        call_command('prune_changes', days=30, batch_size=1)
+
+        assert entries() == [
+            ('title', str(Title.objects.get(name='Свежий').id), 'created')
+        ]
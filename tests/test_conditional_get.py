@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_title_detail_not_modified(
+            self, client, catalog, django_assert_num_queries):
+        url = f'/api/v1/titles/{catalog[0].id}/'
+        response = client.get(url)
+        etag = response['ETag']
+
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается статус 304'
+        )
+
+    def test_if_modified_since_alone(self, client, catalog):
+        url = f'/api/v1/titles/{catalog[0].id}/reviews/'
+        last_modified = client.get(url)['Last-Modified']
+
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304, (
+            'Проверьте, что If-Modified-Since со значением Last-Modified '
+            'возвращает статус 304'
+        )
+
+    def test_review_list_etag_changes_on_write(self, client, catalog, user):
+        title = catalog[1]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+        review = title.reviews_title.create(author=user, text='Ок', score=7)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов'
+        )
+
+        etag = response['ETag']
+        review.delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что удаление отзыва меняет ETag списка отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_author_rename_changes_validators(self, client, catalog):
+        title = catalog[0]
+        review = title.reviews_title.order_by('id').first()
+        comment = review.comments_review.order_by('id').first()
+        urls = [
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            f'{comment.id}/',
+        ]
+        etags = [client.get(url)['ETag'] for url in urls]
+        for author in {review.author, comment.author}:
+            author.username = f'{author.username}-renamed'
+            author.save()
+
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что смена имени автора меняет ETag {url}'
+            )
+
+    def test_update_date_is_not_rendered(self, client, catalog):
+        title = catalog[0]
+        review = title.reviews_title.order_by('id').first()
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        comment = client.get(f'{url}comments/').json()['results'][0]
+        review = client.get(url).json()
+
+        assert 'updated_at' not in review
+        assert 'updated_at' not in comment
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/abc/',
+        '/api/v1/titles/{title}/reviews/abc/',
+    ])
+    def test_malformed_id_is_not_found(self, client, catalog, url):
+        response = client.get(url.format(title=catalog[0].id))
+
+        assert response.status_code == 404, (
+            'Проверьте, что нечисловой id возвращает 404, а не 500'
+        )
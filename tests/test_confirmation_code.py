@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_selects(queries):
+    return [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "api_user"' in query['sql']
+    ]
+
+
+def request_code(client, email):
+    from api.models import OutboxEmail
+    response = client.post('/api/v1/auth/email/', data={'email': email})
+    assert response.status_code == 201
+    return OutboxEmail.objects.filter(recipient__iexact=email).first().message
+
+
+@pytest.mark.django_db
+class TestConfirmationCode:
+
+    def test_code_is_exchanged_for_token(self, client):
+        code = request_code(client, 'new@yamdb.fake')
+
+        response = client.post('/api/v1/auth/token/', data={
+            'email': 'new@yamdb.fake', 'confirmation_code': code,
+        })
+
+        assert response.status_code == 200
+        assert 'access' in response.json()
+
+    def test_code_works_once(self, client):
+        code = request_code(client, 'new@yamdb.fake')
+        data = {'email': 'new@yamdb.fake', 'confirmation_code': code}
+        assert client.post('/api/v1/auth/token/', data=data).status_code == 200
+
+        response = client.post('/api/v1/auth/token/', data=data)
+
+        assert response.status_code == 401, (
+            'Проверьте, что код подтверждения нельзя использовать повторно'
+        )
+
+    def test_wrong_code_is_rejected(self, client, user):
+        response = client.post('/api/v1/auth/token/', data={
+            'email': user.email, 'confirmation_code': '1-deadbeef',
+        })
+
+        assert response.status_code == 401
+
+    def test_email_lookup_ignores_case(self, client, user):
+        from api.models import User
+        code = request_code(client, user.email.upper())
+
+        response = client.post('/api/v1/auth/token/', data={
+            'email': user.email.upper(), 'confirmation_code': code,
+        })
+
+        assert response.status_code == 200
+        assert User.objects.count() == 1
+
+    def test_emails_are_unique_ignoring_case(self, staff_client, user):
+        from django.db import IntegrityError, transaction
+
+        from api.models import User
+        response = staff_client.post('/api/v1/users/', data={
+            'username': 'shouter', 'email': user.email.upper(),
+        })
+        assert response.status_code == 400, (
+            'Проверьте, что email уникален без учёта регистра'
+        )
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            User.objects.create_user(
+                email=user.email.upper(), username='racer'
+            )
+
+    def test_single_user_query_per_call(self, client, user):
+        with CaptureQueriesContext(connection) as queries:
+            code = request_code(client, user.email)
+        assert len(user_selects(queries)) == 1, (
+            'Проверьте, что выдача кода делает один запрос пользователя'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/v1/auth/token/', data={
+                'email': user.email, 'confirmation_code': code,
+            })
+        assert response.status_code == 200
+        assert len(user_selects(queries)) == 1, (
+            'Проверьте, что обмен кода на токен делает один запрос пользователя'
+        )
+
+    def test_codes_are_rate_limited_per_email(self, client, monkeypatch):
+        from api.throttling import ConfirmationCodeThrottle
+        monkeypatch.setattr(
+            ConfirmationCodeThrottle, 'THROTTLE_RATES',
+            {'confirmation_code': '2/hour'},
+        )
+        responses = [
+            client.post('/api/v1/auth/email/', data={'email': email})
+            for email in ('a@yamdb.fake', 'A@yamdb.fake', 'a@yamdb.fake')
+        ]
+        other = client.post(
+            '/api/v1/auth/email/', data={'email': 'b@yamdb.fake'}
+        )
+
+        assert [r.status_code for r in responses] == [201, 201, 429]
+        assert other.status_code == 201
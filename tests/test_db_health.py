@@ -0,0 +1,62 @@
+import time
+
+from api_yamdb.db import check_idle_connections, remember_release_time
+
+
+class FakeConnection:
+
+    def __init__(self, usable):
+        self.connection = object()
+        self.usable = usable
+        self.checked = False
+
+    def is_usable(self):
+        self.checked = True
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class FakeConnections:
+
+    def __init__(self, *items):
+        self.items = items
+
+    def all(self):
+        return list(self.items)
+
+
+class TestConnectionHealthCheck:
+
+    def test_idle_broken_connection_is_closed(self, monkeypatch, settings):
+        settings.DB_HEALTH_CHECK_INTERVAL = 30
+        broken, alive = FakeConnection(False), FakeConnection(True)
+        monkeypatch.setattr(
+            'api_yamdb.db.connections', FakeConnections(broken, alive)
+        )
+        remember_release_time()
+        for connection in (broken, alive):
+            connection.released_at = time.monotonic() - 60
+
+        check_idle_connections()
+
+        assert broken.connection is None, (
+            'Проверьте, что разорванное соединение закрывается до запроса'
+        )
+        assert alive.connection is not None
+
+    def test_recently_used_connection_is_not_checked(
+            self, monkeypatch, settings):
+        settings.DB_HEALTH_CHECK_INTERVAL = 30
+        connection = FakeConnection(False)
+        monkeypatch.setattr(
+            'api_yamdb.db.connections', FakeConnections(connection)
+        )
+        remember_release_time()
+
+        check_idle_connections()
+
+        assert not connection.checked, (
+            'Проверьте, что недавно использованное соединение не проверяется'
+        )
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_signup_only_enqueues_email(self, client):
+        from api.models import OutboxEmail
+        response = client.post(
+            '/api/v1/auth/email/', data={'email': 'new@yamdb.fake'}
+        )
+
+        assert response.status_code == 201
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется во время запроса'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == 'new@yamdb.fake'
+        assert email.status == OutboxEmail.Statuses.PENDING
+
+    def test_worker_sends_batch_over_one_connection(self, monkeypatch):
+        from api.models import OutboxEmail
+        from api.outbox import enqueue_email
+        for number in range(3):
+            enqueue_email('Код', 'secret', f'user{number}@yamdb.fake')
+        opened = []
+        original_open = EmailBackend.open
+
+        def open_connection(backend):
+            opened.append(backend)
+            return original_open(backend)
+
+        monkeypatch.setattr(EmailBackend, 'open', open_connection)
+
+        call_command('send_outbox')
+
+        assert len(mail.outbox) == 3
+        assert len(opened) == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение'
+        )
+        assert set(
+            OutboxEmail.objects.values_list('status', flat=True)
+        ) == {OutboxEmail.Statuses.SENT}
+
+    def test_failed_email_is_retried_with_backoff(self, monkeypatch, settings):
+        from api.models import OutboxEmail
+        from api.outbox import enqueue_email
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        email = enqueue_email('Код', 'secret', 'user@yamdb.fake')
+
+        def broken_send(backend, messages):
+            raise SMTPException('Service unavailable')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        call_command('send_outbox')
+
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Statuses.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается'
+        )
+        assert 'Service unavailable' in email.last_error
+
+        OutboxEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command('send_outbox')
+
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Statuses.FAILED
+        assert email.attempts == 2
+
+    def test_sent_emails_survive_a_crash(self, monkeypatch):
+        from api.models import OutboxEmail
+        from api.outbox import enqueue_email
+        for number in range(3):
+            enqueue_email('Код', 'secret', f'user{number}@yamdb.fake')
+        original_send = EmailBackend.send_messages
+
+        def crash_after_first(backend, messages):
+            if mail.outbox:
+                raise KeyboardInterrupt
+            return original_send(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', crash_after_first)
+        with pytest.raises(KeyboardInterrupt):
+            call_command('send_outbox')
+        monkeypatch.setattr(EmailBackend, 'send_messages', original_send)
+
+        statuses = list(OutboxEmail.objects.order_by('id').values_list(
+            'status', flat=True
+        ))
+        assert statuses == ['sent', 'pending', 'pending'], (
+            'Проверьте, что статус письма сохраняется сразу после отправки'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что взятые в работу письма не отправляются повторно'
+        )
+
+        OutboxEmail.objects.filter(status='pending').update(
+            next_attempt_at=timezone.now()
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 3
+
+    def test_unreachable_server_releases_emails(self, monkeypatch):
+        from api.models import OutboxEmail
+        from api.outbox import enqueue_email
+        email = enqueue_email('Код', 'secret', 'user@yamdb.fake')
+
+        def refuse(backend):
+            raise ConnectionRefusedError
+
+        monkeypatch.setattr(EmailBackend, 'open', refuse)
+        with pytest.raises(OSError):
+            call_command('send_outbox')
+
+        email.refresh_from_db()
+        assert email.attempts == 0
+        assert email.next_attempt_at <= timezone.now()
+
+    def test_prune(self):
+        from api.models import OutboxEmail
+        from api.outbox import enqueue_email
+        for status in ('sent', 'failed', 'pending'):
+            email = enqueue_email('Код', 'secret', f'{status}@yamdb.fake')
+            email.status = status
+            email.save()
+        OutboxEmail.objects.update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        fresh = enqueue_email('Код', 'secret', 'fresh@yamdb.fake')
+        fresh.status = 'sent'
+        fresh.save()
+
+        call_command('prune_outbox', days=7, batch_size=1)
+
+        kept = OutboxEmail.objects.values_list('recipient', flat=True)
+        assert set(kept) == {'pending@yamdb.fake', 'fresh@yamdb.fake'}, (
+            'Проверьте, что удаляются только старые завершённые письма'
+        )
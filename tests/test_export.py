@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Comment, Title
+from api.serializers import CustomTokenObtainPairSerializer
+from api_yamdb.asgi import application
+
+
+def read_ndjson(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_titles_are_streamed_as_ndjson(self, staff_client, catalog):
+        response = staff_client.get('/api/v1/export/titles/')
+
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = read_ndjson(response)
+        assert [row['id'] for row in rows] == sorted(
+            title.id for title in catalog
+        )
+        first = rows[0]
+        assert (first['category'], first['genre']) == (
+            'movie', ['drama', 'comedy']
+        ), 'Проверьте, что выгружаются категория и жанры'
+        assert first['rating'] == 6.5
+
+    def test_reviews_as_csv(self, staff_client, catalog):
+        response = staff_client.get('/api/v1/export/reviews/?format=csv')
+
+        assert response['Content-Type'].startswith('text/csv')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [(row['author'], row['score']) for row in rows] == [
+            ('reviewer', '8'), ('critic', '5')
+        ]
+
+    def test_rows_are_read_in_chunks(
+            self, staff_client, catalog, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        response = staff_client.get('/api/v1/export/titles/')
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = read_ndjson(response)
+
+        assert len(rows) == 5
+        assert len(queries) == 6, (
+            'Проверьте, что каждая пачка читается одним запросом '
+            'и жанры пачки отдельным'
+        )
+
+    def test_incremental_sync(self, staff_client, catalog):
+        url = '/api/v1/export/titles/'
+        rows = read_ndjson(staff_client.get(url, {'id_after': catalog[2].id}))
+        assert [row['id'] for row in rows] == [
+            catalog[3].id, catalog[4].id
+        ]
+
+        since = timezone.now()
+        Title.objects.update(updated_at=since - timedelta(days=1))
+        Title.objects.filter(
+            pk__in=[catalog[1].id, catalog[4].id]
+        ).update(updated_at=since)
+        rows = read_ndjson(
+            staff_client.get(url, {'updated_since': since.isoformat()})
+        )
+        assert [row['id'] for row in rows] == [
+            catalog[1].id, catalog[4].id
+        ], 'Проверьте фильтр updated_since'
+
+        response = staff_client.get(url, {'id_after': 'last'})
+        assert response.status_code == 400
+
+    def test_comments(self, staff_client, catalog):
+        rows = read_ndjson(staff_client.get('/api/v1/export/comments/'))
+
+        assert [(row['id'], row['review'], row['author']) for row in rows] == [
+            (comment.id, comment.review_id, comment.author.username)
+            for comment in Comment.objects.order_by('id')
+        ]
+
+    def test_only_admin_can_export(self, client, user_client):
+        for url in ('/api/v1/export/titles/', '/api/v1/export/comments/'):
+            assert client.get(url).status_code == 401
+            assert user_client.get(url).status_code == 403
+
+
+@async_to_sync
+async def asgi_get(path, token):
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [
+            (b'host', b'testserver'),
+            (b'authorization', f'Bearer {token}'.encode()),
+        ],
+    })
+    await communicator.send_input({'type': 'http.request'})
+    start = await communicator.receive_output(timeout=5)
+    body = b''
+    while True:
+        message = await communicator.receive_output(timeout=5)
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return start['status'], body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_under_asgi(django_user_model, catalog, settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+    admin = django_user_model.objects.create_user(
+        email='admin@yamdb.fake', username='admin', role='admin'
+    )
+    token = CustomTokenObtainPairSerializer.get_token(admin).access_token
+
+    status, body = asgi_get('/api/v1/export/titles/', token)
+
+    assert status == 200
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert [row['id'] for row in rows] == sorted(
+        title.id for title in catalog
+    ), 'Проверьте, что выгрузка работает под ASGI'
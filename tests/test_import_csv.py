@@ -0,0 +1,29 @@
+import pytest
+from django.core.management import call_command
+
+from api.models import Comment, Review, Title
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    def test_import_csv(self):
+        call_command('import_csv', batch_size=10)
+
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда import_csv загружает произведения'
+        )
+        assert Title.genre.through.objects.count() == 42, (
+            'Проверьте, что команда import_csv загружает жанры произведений'
+        )
+        assert Review.objects.count() == 73, (
+            'Проверьте, что повторные отзывы автора на произведение пропускаются'
+        )
+        assert Comment.objects.count() == 5
+        title = Title.objects.get(pk=1)
+        assert title.review_count == title.reviews_title.count(), (
+            'Проверьте, что после загрузки пересчитывается рейтинг'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берется из файла'
+        )
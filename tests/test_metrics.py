@@ -0,0 +1,91 @@
+import json
+import logging
+
+import pytest
+
+from api_yamdb.metrics import registry
+
+
+TOKEN = 'secret-token'
+
+
+@pytest.fixture
+def metrics(settings):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = TOKEN
+    registry.clear()
+    yield registry
+    registry.clear()
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    def test_server_timing_header(self, client, metrics, catalog):
+        response = client.get('/api/v1/titles/', HTTP_X_METRICS_TOKEN=TOKEN)
+
+        assert response.status_code == 200
+        app, db = response['Server-Timing'].split(', ')
+        assert app.startswith('app;dur=')
+        assert db.startswith('db;dur=') and db.endswith(' queries"'), (
+            'Проверьте, что в Server-Timing есть время и число SQL-запросов'
+        )
+
+    def test_histograms_by_view_name(self, client, metrics, catalog):
+        title = catalog[0]
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+        text = client.get(
+            '/metrics', HTTP_X_METRICS_TOKEN=TOKEN
+        ).content.decode()
+
+        assert (
+            'yamdb_request_duration_seconds_count{view="title-list"} 2'
+            in text
+        ), 'Проверьте, что запросы группируются по имени представления'
+        assert (
+            'yamdb_request_duration_seconds_bucket'
+            '{view="review-list",le="+Inf"} 1' in text
+        )
+        assert 'yamdb_request_queries_sum{view="title-list"}' in text
+        assert 'yamdb_response_bytes_total{view="review-list"}' in text
+
+    def test_log_line(self, client, metrics, title, caplog):
+        with caplog.at_level(logging.INFO, logger='api_yamdb.metrics'):
+            client.get(f'/api/v1/titles/{title.id}/')
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['view'] == 'title-detail'
+        assert record['status'] == 200
+        assert record['queries'] >= 1
+        assert record['bytes'] > 0
+
+    def test_only_trusted_clients_see_timings(self, client, metrics, title):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_X_METRICS_TOKEN='guess'
+        )
+
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что Server-Timing отдаётся только с токеном'
+        )
+        assert client.get('/metrics').status_code == 403
+        assert client.get(
+            '/metrics', HTTP_X_METRICS_TOKEN='guess'
+        ).status_code == 403
+
+    def test_unresolved_path(self, client, metrics):
+        client.get('/nowhere/')
+
+        assert 'view="unresolved"' in registry.render()
+
+    def test_disabled_by_default(self, client, settings, title):
+        settings.METRICS_ENABLED = False
+
+        response = client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_X_METRICS_TOKEN=TOKEN
+        )
+
+        assert 'Server-Timing' not in response
+        assert client.get('/metrics').status_code == 404
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+
+def migrate(target):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate([target])
+    return executor.loader.project_state([target]).apps
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMigrations:
+
+    def test_duplicate_reviews_are_removed(self):
+        leaf = MigrationExecutor(connection).loader.graph.leaf_nodes('api')[0]
+        apps = migrate(('api', '0003_updated_at'))
+        try:
+            User = apps.get_model('api', 'User')
+            Title = apps.get_model('api', 'Title')
+            Review = apps.get_model('api', 'Review')
+            Comment = apps.get_model('api', 'Comment')
+            author = User.objects.create(
+                username='reviewer', email='reviewer@yamdb.fake'
+            )
+            other = User.objects.create(
+                username='critic', email='critic@yamdb.fake'
+            )
+            title = Title.objects.create(
+                name='Title', year=2000, review_count=3, score_sum=18,
+                rating=6,
+            )
+            first = Review.objects.create(
+                title=title, author=author, text='first', score=4
+            )
+            repeated = Review.objects.create(
+                title=title, author=author, text='again', score=10
+            )
+            Review.objects.create(
+                title=title, author=other, text='other', score=4
+            )
+            Comment.objects.create(review=repeated, author=other, text='?')
+
+            apps = migrate(('api', '0004_lookup_indexes'))
+            Review = apps.get_model('api', 'Review')
+            title = apps.get_model('api', 'Title').objects.get(pk=title.pk)
+        finally:
+            migrate(leaf)
+
+        kept = Review.objects.filter(author=author.pk)
+        assert [review.pk for review in kept] == [first.pk], (
+            'Проверьте, что остаётся первый отзыв автора'
+        )
+        rating = (title.review_count, title.score_sum, title.rating)
+        assert rating == (2, 8, 4), (
+            'Проверьте, что рейтинг произведения пересчитан'
+        )
+
+    def test_emails_differing_in_case_are_disabled(self):
+        leaf = MigrationExecutor(connection).loader.graph.leaf_nodes('api')[0]
+        apps = migrate(('api', '0007_outbox_email'))
+        try:
+            User = apps.get_model('api', 'User')
+            first = User.objects.create(username='bob', email='bob@x.io')
+            second = User.objects.create(username='Bob', email='Bob@x.io')
+
+            apps = migrate(('api', '0008_user_email_upper_index'))
+            User = apps.get_model('api', 'User')
+            users = {user.pk: user for user in User.objects.all()}
+        finally:
+            migrate(leaf)
+
+        assert users[first.pk].email == 'bob@x.io'
+        assert users[second.pk].email == f'duplicate-{second.pk}-Bob@x.io'
+        assert not users[second.pk].is_active, (
+            'Проверьте, что повторяющийся email отключается до индекса'
+        )
@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestNestedRoutes:
+
+    def test_missing_parent_is_not_found(self, client, catalog):
+        review = catalog[0].reviews_title.order_by('id').first()
+        urls = (
+            '/api/v1/titles/999/reviews/',
+            f'/api/v1/titles/{catalog[1].id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{catalog[0].id}/reviews/999/comments/',
+        )
+        for url in urls:
+            assert client.get(url).status_code == 404, (
+                f'Проверьте, что GET запрос на `{url}` возвращает статус 404'
+            )
+
+    def test_empty_list_of_existing_parent(self, client, catalog):
+        response = client.get(f'/api/v1/titles/{catalog[1].id}/reviews/')
+
+        assert response.status_code == 200
+        assert response.json()['results'] == []
+
+    def test_review_detail_fetches_parent_in_same_query(
+            self, client, catalog, django_assert_num_queries):
+        review = catalog[0].reviews_title.order_by('id').first()
+
+        with django_assert_num_queries(2):
+            response = client.get(
+                f'/api/v1/titles/{catalog[0].id}/reviews/{review.id}/'
+            )
+
+        assert response.status_code == 200
+        wrong_title = f'/api/v1/titles/{catalog[1].id}/reviews/{review.id}/'
+        assert client.get(wrong_title).status_code == 404
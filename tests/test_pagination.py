@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import CursorPagination
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_cursor_mode_skips_count(self, client, catalog):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                '/api/v1/titles/', {'pagination': 'cursor'}
+            )
+
+        assert response.status_code == 200
+        assert 'count' not in response.json(), (
+            'Проверьте, что в режиме cursor не возвращается поле `count`'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ), 'Проверьте, что в режиме cursor не выполняется COUNT запрос'
+
+    def test_cursor_mode_walks_all_titles(self, client, catalog,
+                                          monkeypatch):
+        # Paginators read PAGE_SIZE when DRF is imported.
+        monkeypatch.setattr(CursorPagination, 'page_size', 2)
+        url = '/api/v1/titles/?pagination=cursor'
+        seen, pages = [], 0
+        while url:
+            data = client.get(url).json()
+            seen.extend(title['id'] for title in data['results'])
+            pages += 1
+            url = data['next']
+
+        assert pages == 3
+        assert seen == sorted((t.id for t in catalog), reverse=True), (
+            'Проверьте, что ссылки next в режиме cursor обходят все записи'
+        )
+
+    def test_cursor_mode_walks_reviews(self, client, catalog, monkeypatch):
+        monkeypatch.setattr(CursorPagination, 'page_size', 1)
+        title = catalog[0]
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        seen = []
+        while url:
+            data = client.get(url).json()
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+
+        assert seen == list(
+            title.reviews_title.order_by('-pub_date').values_list(
+                'id', flat=True
+            )
+        ), 'Проверьте, что отзывы в режиме cursor идут по дате публикации'
+
+    def test_cursor_mode_rejects_search(self, client, catalog):
+        response = client.get(
+            '/api/v1/titles/', {'pagination': 'cursor', 'search': 'фильм'}
+        )
+
+        assert response.status_code == 400, (
+            'Проверьте, что поиск с рангом нельзя листать в режиме cursor'
+        )
+        assert 'search' in response.json()
+
+    def test_page_number_mode_is_default(self, client, catalog):
+        data = client.get('/api/v1/titles/').json()
+
+        assert data['count'] == len(catalog), (
+            'Проверьте, что по умолчанию используется постраничная пагинация'
+        )
@@ -0,0 +1,118 @@
+import pytest
+from django.urls import URLResolver, reverse
+
+from api.models import Comment
+from api.urls import urlpatterns
+from api_yamdb.querycheck import find_problems, normalize, record_queries
+
+
+def readable_routes(patterns):
+    """Names and URL kwargs of every GET route of the API."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from readable_routes(pattern.url_patterns)
+            continue
+        kwargs = list(pattern.pattern.regex.groupindex)
+        if 'format' in kwargs:
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, 'actions', None)
+        readable = (
+            'get' in actions if actions is not None
+            else hasattr(getattr(callback, 'cls', None), 'get')
+        )
+        if readable:
+            yield pattern.name, kwargs
+
+
+ROUTES = sorted(set(
+    (name, tuple(kwargs)) for name, kwargs in readable_routes(urlpatterns)
+))
+
+
+@pytest.fixture
+def route_kwargs(catalog):
+    title = catalog[0]
+    review = title.reviews_title.order_by('id').first()
+    comment = review.comments_review.order_by('id').first()
+    return {
+        'title_id': title.id,
+        'review_id': review.id,
+        'username': review.author.username,
+        'pk': {
+            'title': title.id,
+            'review': review.id,
+            'comment': comment.id,
+        },
+    }
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+
+    def test_routes_are_found(self):
+        names = {name for name, _ in ROUTES}
+        assert {'title-list', 'comment-detail', 'export_titles'} <= names
+
+    @pytest.mark.parametrize(
+        'name, kwargs', ROUTES, ids=[name for name, _ in ROUTES]
+    )
+    def test_route_has_no_repeated_queries(
+            self, staff_client, route_kwargs, query_check, name, kwargs):
+        url_kwargs = {
+            kwarg: (
+                route_kwargs['pk'][name.split('-')[0]] if kwarg == 'pk'
+                else route_kwargs[kwarg]
+            )
+            for kwarg in kwargs
+        }
+        url = reverse(name, kwargs=url_kwargs)
+
+        with query_check(name):
+            response = staff_client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос на `{url}` возвращает статус 200'
+        )
+
+
+@pytest.mark.django_db
+class TestQueryCheck:
+
+    def test_normalize_keeps_only_shape(self):
+        assert normalize(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'a'  LIMIT 21"
+        ) == 'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?'
+
+    def test_per_row_fetch_is_reported(self, catalog):
+        with record_queries() as recorder:
+            authors = [
+                comment.author.username for comment in Comment.objects.all()
+            ]
+
+        assert len(authors) == 3
+        problems = find_problems(recorder.queries)
+        assert len(problems) == 1 and 'FROM "api_user"' in problems[0], (
+            'Проверьте, что повторяющиеся запросы к авторам обнаруживаются'
+        )
+
+    def test_budget_and_explain(self, catalog, settings):
+        settings.QUERYCHECK_EXPLAIN_MS = 0
+        with record_queries() as recorder:
+            list(Comment.objects.select_related('author'))
+
+        problems = find_problems(recorder.queries, budget=1)
+        assert ' ms: SELECT' in problems[0]
+        assert 'SCAN' in problems[0] or 'SEARCH' in problems[0], (
+            'Проверьте, что для медленных запросов выводится план'
+        )
+
+        settings.QUERYCHECK_EXPLAIN_MS = None
+        with record_queries() as recorder:
+            list(Comment.objects.all())
+            list(Comment.objects.all())
+        assert find_problems(recorder.queries, budget=1) == [
+            '2 queries, the budget is 1'
+        ]
@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+
+    @pytest.mark.parametrize('url, queries', [
+        ('/api/v1/titles/', 3),
+        ('/api/v1/titles/{title}/', 3),
+        ('/api/v1/titles/{title}/reviews/', 3),
+        ('/api/v1/titles/{title}/reviews/{review}/comments/', 3),
+    ])
+    def test_list_query_count_is_fixed(
+            self, client, catalog, django_assert_num_queries, url, queries):
+        title = catalog[0]
+        review = title.reviews_title.order_by('id').first()
+        url = url.format(title=title.id, review=review.id)
+
+        with django_assert_num_queries(queries):
+            response = client.get(url)
+
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос на `{url}` возвращает статус 200'
+        )
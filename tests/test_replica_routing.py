@@ -0,0 +1,116 @@
+import pytest
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.serializers import CustomTokenObtainPairSerializer
+from api_yamdb.routers import PIN_COOKIE, ReplicaRoutingMiddleware
+
+
+def routed_request(request):
+    from api.models import Title
+    used = []
+
+    def view(request):
+        used.append(router.db_for_read(Title))
+        return HttpResponse()
+
+    response = ReplicaRoutingMiddleware(view)(request)
+    return used[0], response
+
+
+class TestReplicaRouting:
+
+    def test_safe_requests_read_from_replica(self, settings):
+        settings.REPLICA_DATABASES = ['replica']
+
+        database, response = routed_request(
+            RequestFactory().get('/api/v1/titles/')
+        )
+
+        assert database == 'replica', (
+            'Проверьте, что GET-запросы читают из реплики'
+        )
+        assert PIN_COOKIE not in response.cookies
+
+    def test_one_replica_per_request(self, settings):
+        from api.models import Title
+        settings.REPLICA_DATABASES = ['replica1', 'replica2', 'replica3']
+        used = []
+
+        def view(request):
+            used.extend(router.db_for_read(Title) for _ in range(20))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(RequestFactory().get('/api/v1/'))
+
+        assert len(set(used)) == 1, (
+            'Проверьте, что все чтения запроса идут в одну реплику'
+        )
+
+    def test_write_pins_client_to_primary(self, settings):
+        settings.REPLICA_DATABASES = ['replica']
+        factory = RequestFactory()
+
+        database, response = routed_request(
+            factory.post('/api/v1/titles/1/reviews/')
+        )
+        assert database == 'default'
+        assert response.cookies[PIN_COOKIE]['max-age'] == (
+            settings.REPLICA_PIN_SECONDS
+        )
+
+        request = factory.get('/api/v1/titles/1/reviews/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        database, _ = routed_request(request)
+        assert database == 'default', (
+            'Проверьте, что после записи клиент читает из основной БД'
+        )
+
+    @pytest.mark.django_db
+    def test_write_pins_token_user_to_primary(
+        self, settings, user, another_user
+    ):
+        settings.REPLICA_DATABASES = ['replica']
+
+        def authorized(method, author):
+            token = CustomTokenObtainPairSerializer.get_token(author)
+            return getattr(RequestFactory(), method)(
+                '/api/v1/titles/1/reviews/',
+                HTTP_AUTHORIZATION=f'Bearer {token.access_token}',
+            )
+
+        routed_request(authorized('post', user))
+
+        database, _ = routed_request(authorized('get', user))
+        assert database == 'default', (
+            'Проверьте, что после записи клиент с токеном читает из '
+            'основной БД и без cookie'
+        )
+        database, _ = routed_request(authorized('get', another_user))
+        assert database == 'replica', (
+            'Проверьте, что запись закрепляет за основной БД только автора'
+        )
+
+    def test_reads_outside_requests_use_primary(self, settings):
+        from api.models import Title
+        settings.REPLICA_DATABASES = ['replica']
+
+        assert router.db_for_read(Title) == 'default'
+        assert router.db_for_write(Title) == 'default'
+
+    def test_migrations_skip_replicas(self, settings):
+        settings.REPLICA_DATABASES = ['replica']
+
+        assert not router.allow_migrate('replica', 'api')
+        assert router.allow_migrate('default', 'api')
+
+    def test_without_replicas_everything_uses_default(self, settings):
+        settings.REPLICA_DATABASES = []
+
+        database, response = routed_request(
+            RequestFactory().post('/api/v1/titles/1/reviews/')
+        )
+
+        assert database == 'default'
+        assert PIN_COOKIE not in response.cookies
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_versions
+from api.models import Genre
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_anonymous_list_is_cached(
+            self, client, catalog, django_assert_num_queries):
+        first = client.get('/api/v1/titles/').json()
+
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/titles/').json()
+
+        assert first == second, (
+            'Проверьте, что повторный анонимный запрос отдается из кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_write_invalidates_cached_list(self, client, catalog):
+        client.get('/api/v1/genres/')
+        Genre.objects.create(name='Вестерн', slug='western')
+
+        data = client.get('/api/v1/genres/').json()
+
+        assert data['count'] == 3, (
+            'Проверьте, что изменение модели сбрасывает закэшированный ответ'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_review_invalidates_cached_title(self, client, catalog, user):
+        title = catalog[1]
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] is None
+        title.reviews_title.create(author=user, text='Хорошо', score=9)
+
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_no_caching_while_replicas_may_lag(
+            self, client, catalog, settings):
+        settings.REPLICA_DATABASES = ['replica']
+        Genre.objects.create(name='Вестерн', slug='western')
+        settings.REPLICA_DATABASES = []
+        client.get('/api/v1/genres/')
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get('/api/v1/genres/')
+
+        assert queries.captured_queries, (
+            'Проверьте, что ответы не кэшируются, пока реплики отстают'
+        )
+
+    def test_cache_can_be_turned_off(
+            self, client, catalog, settings, django_assert_num_queries):
+        settings.API_CACHE_TIMEOUT = 0
+        client.get('/api/v1/titles/')
+
+        with django_assert_num_queries(3):
+            client.get('/api/v1/titles/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_versions_move_after_commit(self):
+        before = get_versions([Genre])
+        with transaction.atomic():
+            Genre.objects.create(name='Вестерн', slug='western')
+            assert get_versions([Genre]) == before, (
+                'Проверьте, что версия кэша меняется только после коммита'
+            )
+
+        assert get_versions([Genre]) != before
@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+
+    def test_second_review_is_rejected(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Шедевр', 'score': 10}
+        response = user_client.post(url, data=data)
+        assert response.status_code == 201
+
+        response = user_client.post(url, data=data)
+
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв автора возвращает статус 400'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Authors review already exists']
+        }
+        assert title.reviews_title.count() == 1
+
+    def test_moving_review_to_reviewed_title_is_rejected(
+            self, user_client, catalog):
+        first, second = catalog[0], catalog[1]
+        data = {'text': 'Шедевр', 'score': 10}
+        user_client.post(f'/api/v1/titles/{first.id}/reviews/', data=data)
+        response = user_client.post(
+            f'/api/v1/titles/{second.id}/reviews/', data=data
+        )
+        url = f'/api/v1/titles/{second.id}/reviews/{response.json()["id"]}/'
+
+        response = user_client.patch(url, data={'title': first.id})
+
+        assert response.status_code == 400, (
+            'Проверьте, что перенос отзыва к уже оценённому произведению '
+            'возвращает статус 400'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Authors review already exists']
+        }
+
+    def test_review_create_does_not_check_duplicates(self, user_client, title):
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Шедевр', 'score': 10},
+            )
+
+        assert response.status_code == 201
+        review_selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "api_review"' in query['sql']
+        ]
+        assert not review_selects, (
+            'Проверьте, что дубликат отзыва проверяется ограничением БД'
+        )
+
+    def test_review_for_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', data={'text': 'Ок', 'score': 5}
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def token_client(user):
+    from api.serializers import CustomTokenObtainPairSerializer
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def user_selects(queries):
+    return [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "api_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestStatelessJWT:
+
+    def test_authentication_does_not_load_user(self, user, title):
+        client = token_client(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert client.get(url).status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert not user_selects(queries), (
+            'Проверьте, что пользователь берётся из токена без запроса к БД'
+        )
+
+    def test_token_creates_review(self, user, title):
+        response = token_client(user).post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Шедевр', 'score': 10},
+        )
+
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+
+    def test_role_change_revokes_token(self, user, title):
+        client = token_client(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert client.get(url).status_code == 200
+
+        user.role = 'moderator'
+        user.save()
+
+        assert client.get(url).status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+        assert token_client(user).get(url).status_code == 200
+
+    def test_unrelated_change_keeps_token(self, user, title):
+        client = token_client(user)
+        user.bio = 'Люблю кино'
+        user.save()
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+        assert response.status_code == 200
+
+    def test_deactivated_user_is_rejected(self, user, title):
+        client = token_client(user)
+        user.is_active = False
+        user.save()
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+        assert response.status_code == 401
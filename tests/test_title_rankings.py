@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.models import Review, Title
+
+
+def ids(response):
+    return [item['id'] for item in response.json()['results']]
+
+
+@pytest.fixture
+def rated_titles(user, another_user, django_user_model):
+    third_user = django_user_model.objects.create_user(
+        email='fan@yamdb.fake', username='fan'
+    )
+    single, popular, unrated = (
+        Title.objects.create(name=name, year=2000)
+        for name in ('Один отзыв', 'Популярный', 'Без отзывов')
+    )
+    Review.objects.create(title=single, author=user, text='Да', score=10)
+    for author in (user, another_user, third_user):
+        Review.objects.create(title=popular, author=author, text='Да', score=8)
+    return single, popular, unrated
+
+
+@pytest.mark.django_db
+class TestTitleRankings:
+
+    def test_weighted_rating_guards_few_reviews(self, client, rated_titles):
+        single, popular, unrated = rated_titles
+
+        response = client.get('/api/v1/titles/?ordering=-rating')
+
+        assert ids(response) == [popular.id, single.id, unrated.id], (
+            'Проверьте, что одна высокая оценка не обгоняет много хороших'
+        )
+
+    def test_review_count_ordering(self, client, rated_titles):
+        single, popular, unrated = rated_titles
+
+        response = client.get('/api/v1/titles/?ordering=review_count')
+
+        assert ids(response) == [unrated.id, single.id, popular.id]
+
+    def test_trending_counts_recent_reviews(self, client, rated_titles):
+        single, popular, unrated = rated_titles
+        Review.objects.filter(title=popular).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        call_command('refresh_rankings')
+
+        response = client.get('/api/v1/titles/?ordering=-trending')
+
+        assert ids(response) == [single.id, unrated.id, popular.id], (
+            'Проверьте, что старые отзывы не попадают в популярное'
+        )
+
+    def test_ties_are_broken_by_id(self, client):
+        titles = [
+            Title.objects.create(name=f'Фильм {number}', year=2000)
+            for number in range(3)
+        ]
+
+        response = client.get('/api/v1/titles/?ordering=-rating')
+
+        assert ids(response) == [title.id for title in reversed(titles)]
+
+    def test_cursor_pagination_keeps_ordering(self, client, rated_titles):
+        single, popular, unrated = rated_titles
+
+        response = client.get(
+            '/api/v1/titles/?ordering=-rating&pagination=cursor'
+        )
+
+        assert ids(response) == [popular.id, single.id, unrated.id]
+
+    def test_unknown_ordering(self, client):
+        response = client.get('/api/v1/titles/?ordering=name')
+
+        assert response.status_code == 400
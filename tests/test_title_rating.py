@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import call_command
+
+from api.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_reviews(self, title, user, another_user):
+        review = Review.objects.create(
+            title=title, author=user, text='Отлично', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Неплохо', score=6
+        )
+        title.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.rating) == (2, 16, 8), (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва'
+        )
+
+        review.score = 2
+        review.save()
+        title.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.rating) == (2, 8, 4), (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки'
+        )
+
+        review.delete()
+        title.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.rating) == (1, 6, 6), (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+        )
+
+        another_user.delete()
+        title.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.rating) == (0, 0, None), (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении'
+        )
+
+    def test_refresh_ratings_command(self, title, user):
+        Review.objects.create(title=title, author=user, text='Ок', score=7)
+        Title.objects.update(rating=None, review_count=0, score_sum=0)
+
+        call_command('refresh_ratings', batch_size=1)
+
+        title.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.rating) == (1, 7, 7), (
+            'Проверьте, что команда refresh_ratings пересчитывает рейтинг'
+        )
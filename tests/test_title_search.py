@@ -0,0 +1,33 @@
+import pytest
+
+from api.models import Title
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_search_ranks_name_matches_first(self, client, catalog):
+        described = Title.objects.create(
+            name='Без названия', description='Фильм про space travel'
+        )
+        named = Title.objects.create(name='Space Odyssey', year=1968)
+
+        data = client.get('/api/v1/titles/', {'search': 'space'}).json()
+
+        assert [title['id'] for title in data['results']] == [
+            named.id, described.id
+        ], (
+            'Проверьте, что поиск находит совпадения в названии и описании '
+            'и ставит совпадения в названии выше'
+        )
+
+    def test_search_combines_with_filters(self, client, catalog):
+        Title.objects.create(name='Space Odyssey', year=1968)
+        catalog[0].name = 'Space Jam'
+        catalog[0].save()
+
+        data = client.get(
+            '/api/v1/titles/', {'search': 'space', 'genre': 'drama'}
+        ).json()
+
+        assert [title['id'] for title in data['results']] == [catalog[0].id]
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+from api.models import Review, TitleStats
+
+
+def scores(**counts):
+    return {
+        str(score): counts.get(f'score_{score}', 0) for score in range(1, 11)
+    }
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def test_histogram_follows_reviews(
+            self, client, title, user, another_user):
+        url = f'/api/v1/titles/{title.id}/stats/'
+        review = Review.objects.create(
+            title=title, author=user, text='Отлично', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Неплохо', score=6
+        )
+        assert client.get(url).json() == {
+            'title': title.id,
+            'review_count': 2,
+            'rating': 8,
+            'scores': scores(score_6=1, score_10=1),
+        }, 'Проверьте, что гистограмма обновляется при создании отзыва'
+
+        review.score = 2
+        review.save()
+        assert client.get(url).json()['scores'] == scores(
+            score_2=1, score_6=1
+        ), 'Проверьте, что гистограмма обновляется при изменении оценки'
+
+        review.delete()
+        data = client.get(url).json()
+        assert (data['review_count'], data['scores']) == (
+            1, scores(score_6=1)
+        ), 'Проверьте, что гистограмма обновляется при удалении отзыва'
+
+    def test_stats_are_read_in_one_query(
+            self, client, catalog, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.get(f'/api/v1/titles/{catalog[0].id}/stats/')
+
+        assert response.json()['scores'] == scores(score_5=1, score_8=1)
+
+    def test_title_without_reviews(self, client, title):
+        data = client.get(f'/api/v1/titles/{title.id}/stats/').json()
+
+        assert (data['review_count'], data['rating']) == (0, None)
+        assert data['scores'] == scores()
+
+    def test_missing_title(self, client):
+        assert client.get('/api/v1/titles/999/stats/').status_code == 404
+
+    def test_rebuild_matches_incremental_updates(self, catalog):
+        expected = list(TitleStats.objects.values())
+        TitleStats.objects.all().delete()
+
+        call_command('rebuild_title_stats', batch_size=2)
+
+        assert list(TitleStats.objects.values()) == expected, (
+            'Проверьте, что команда пересобирает гистограммы по отзывам'
+        )